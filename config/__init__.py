@@ -1,2 +1,11 @@
 """Configuration module for claude-continue daemon."""
 from .config import *
+
+
+def __getattr__(name):
+    # FOLLOWUP_PROMPTS is loaded lazily by config.config.__getattr__;
+    # star import skips it, so delegate attribute access explicitly.
+    if name == "FOLLOWUP_PROMPTS":
+        from .config import FOLLOWUP_PROMPTS
+        return FOLLOWUP_PROMPTS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,39 +2,76 @@
 Configuration for claude-continue daemon.
 Monitors iTerm2 sessions running Claude Code and auto-responds to prompts.
 """
+import functools
+import itertools
 import os
+import random
+import re
+
+# Snapshot of the environment taken once at import.  Every setting below
+# resolves through a single dict lookup instead of repeated os.getenv calls.
+_ENV = os.environ
+
+
+def _bool(name: str, default: bool) -> bool:
+    """Read a boolean env var ("true"/"false") with a single dict lookup."""
+    value = _ENV.get(name)
+    return default if value is None else value.lower() == "true"
+
+
+def _float(name: str, default: float) -> float:
+    """Read a float env var with a single dict lookup."""
+    value = _ENV.get(name)
+    return default if value is None else float(value)
+
+
+def _str(name: str, default: str) -> str:
+    """Read a string env var with a single dict lookup."""
+    value = _ENV.get(name)
+    return default if value is None else value
+
 
 # =============================================================================
 # DAEMON BEHAVIOR
 # =============================================================================
 
 # Auto-approve all permission requests (use with caution!)
-AUTO_APPROVE_ALL = os.getenv("CLAUDE_CONTINUE_AUTO_APPROVE", "true").lower() == "true"
+AUTO_APPROVE_ALL = _bool("CLAUDE_CONTINUE_AUTO_APPROVE", True)
 
 # Cooldown between actions to prevent rapid-fire responses (seconds)
-ACTION_COOLDOWN_SECONDS = float(os.getenv("CLAUDE_CONTINUE_COOLDOWN", "1.0"))
+ACTION_COOLDOWN_SECONDS = _float("CLAUDE_CONTINUE_COOLDOWN", 1.0)
 
 # How often to poll for new sessions (seconds)
-SESSION_POLL_INTERVAL = float(os.getenv("CLAUDE_CONTINUE_POLL_INTERVAL", "2.0"))
+SESSION_POLL_INTERVAL = _float("CLAUDE_CONTINUE_POLL_INTERVAL", 2.0)
 
 # Session name filter (regex pattern) - matches iTerm2 tab/window titles
-SESSION_NAME_FILTER = os.getenv("CLAUDE_CONTINUE_SESSION_FILTER", r".*")
+SESSION_NAME_FILTER = _str("CLAUDE_CONTINUE_SESSION_FILTER", r".*")
+
+# Compiled once here so callers match against a ready pattern object
+# instead of re-compiling (or hitting re's cache lock) on every poll.
+SESSION_NAME_FILTER_RE = re.compile(SESSION_NAME_FILTER)
 
 # Screen polling interval (how often to check for new content, seconds)
-SCREEN_POLL_INTERVAL = float(os.getenv("CLAUDE_CONTINUE_SCREEN_POLL", "0.5"))
+SCREEN_POLL_INTERVAL = _float("CLAUDE_CONTINUE_SCREEN_POLL", 0.5)
+
+# Adaptive polling bounds for the fallback screen poller: poll fast while
+# the screen is changing, back off exponentially toward the max when idle.
+SCREEN_POLL_MIN = _float("CLAUDE_CONTINUE_SCREEN_POLL_MIN", 0.1)
+SCREEN_POLL_MAX = _float("CLAUDE_CONTINUE_SCREEN_POLL_MAX", 2.0)
+SCREEN_POLL_BACKOFF = _float("CLAUDE_CONTINUE_SCREEN_POLL_BACKOFF", 1.5)
 
 # =============================================================================
 # CONTINUATION BEHAVIOR
 # =============================================================================
 
 # Whether to automatically continue when Claude stops
-AUTO_CONTINUE = os.getenv("CLAUDE_CONTINUE_AUTO_CONTINUE", "true").lower() == "true"
+AUTO_CONTINUE = _bool("CLAUDE_CONTINUE_AUTO_CONTINUE", True)
 
 # Message to send when Claude needs to continue
-CONTINUE_MESSAGE = os.getenv("CLAUDE_CONTINUE_MESSAGE", "continue")
+CONTINUE_MESSAGE = _str("CLAUDE_CONTINUE_MESSAGE", "continue")
 
 # How long to wait before sending continue (seconds)
-CONTINUE_DELAY = float(os.getenv("CLAUDE_CONTINUE_DELAY", "2.0"))
+CONTINUE_DELAY = _float("CLAUDE_CONTINUE_DELAY", 2.0)
 
 # =============================================================================
 # IDLE/COMPLETION BEHAVIOR
@@ -42,37 +79,45 @@ CONTINUE_DELAY = float(os.getenv("CLAUDE_CONTINUE_DELAY", "2.0"))
 
 # Whether to send follow-up prompts when Claude finishes a task
 # DISABLED BY DEFAULT - can send unwanted prompts to wrong sessions
-AUTO_FOLLOWUP = os.getenv("CLAUDE_CONTINUE_AUTO_FOLLOWUP", "false").lower() == "true"
+AUTO_FOLLOWUP = _bool("CLAUDE_CONTINUE_AUTO_FOLLOWUP", False)
 
 # How long to wait after Claude finishes before sending follow-up (seconds)
 # This should be longer than CONTINUE_DELAY to avoid overlap
-FOLLOWUP_DELAY = float(os.getenv("CLAUDE_CONTINUE_FOLLOWUP_DELAY", "5.0"))
+FOLLOWUP_DELAY = _float("CLAUDE_CONTINUE_FOLLOWUP_DELAY", 5.0)
 
 # Minimum time between follow-up prompts (seconds) to avoid spamming
-FOLLOWUP_COOLDOWN = float(os.getenv("CLAUDE_CONTINUE_FOLLOWUP_COOLDOWN", "30.0"))
-
-# Follow-up prompts to send when Claude is idle (rotated randomly)
-# NOTE: These are marked [AUTO] to indicate automated messages
-# Be cautious - these can trigger unwanted actions!
-FOLLOWUP_PROMPTS = [
-    # Gentle continuation prompts (safest)
-    "[AUTO] What's the current status? Please summarize without taking action.",
-    "[AUTO] Are there any pending tasks? List them but wait for confirmation before proceeding.",
-    "[AUTO] What would be the next logical step? Describe it but don't execute yet.",
-
-    # Status checks (read-only, safe)
-    "[AUTO] Can you show me the current todo list status?",
-    "[AUTO] What files have been modified in this session?",
-    "[AUTO] Summarize what we've accomplished so far.",
-
-    # Deep thinking (safe - just asks to think)
-    "[AUTO] Think step by step about potential edge cases we might have missed.",
-    "[AUTO] What are the risks or potential issues with the current approach?",
-
-    # Clarification (safe - asks for info)
-    "[AUTO] Is there anything unclear that needs clarification before continuing?",
-    "[AUTO] What assumptions are we making that should be verified?",
-]
+FOLLOWUP_COOLDOWN = _float("CLAUDE_CONTINUE_FOLLOWUP_COOLDOWN", 30.0)
+
+# The follow-up prompt list lives in config/followups.py and is loaded
+# lazily: daemons that keep AUTO_FOLLOWUP=false (the default) never pay
+# for it.  Access FOLLOWUP_PROMPTS via this module's __getattr__ below.
+
+@functools.lru_cache(maxsize=1)
+def _followup_rotation():
+    """Build the pre-shuffled prompt rotation on first use.
+
+    A dedicated Random instance keeps us off the global random module's
+    shared state, and cycling a shuffled tuple makes each pick an O(1)
+    next() with no per-call RNG work.
+    """
+    from .followups import FOLLOWUP_PROMPTS
+    order = list(FOLLOWUP_PROMPTS)
+    random.Random().shuffle(order)
+    return itertools.cycle(tuple(order))
+
+
+def next_followup() -> str:
+    """Return the next follow-up prompt in the pre-shuffled rotation."""
+    return next(_followup_rotation())
+
+
+def __getattr__(name):
+    # Lazy re-export so config.FOLLOWUP_PROMPTS still works without the
+    # prompt data being parsed on the common (AUTO_FOLLOWUP=false) path.
+    if name == "FOLLOWUP_PROMPTS":
+        from .followups import FOLLOWUP_PROMPTS
+        return FOLLOWUP_PROMPTS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # =============================================================================
 # QUESTION ANSWERING
@@ -80,20 +125,20 @@ FOLLOWUP_PROMPTS = [
 
 # Whether to answer questions (uses smart regex patterns)
 # DISABLED BY DEFAULT - too risky, can send "yes" to wrong prompts
-ANSWER_QUESTIONS = os.getenv("CLAUDE_CONTINUE_ANSWER_QUESTIONS", "false").lower() == "true"
+ANSWER_QUESTIONS = _bool("CLAUDE_CONTINUE_ANSWER_QUESTIONS", False)
 
 # =============================================================================
 # LOGGING
 # =============================================================================
-LOG_LEVEL = os.getenv("CLAUDE_CONTINUE_LOG_LEVEL", "INFO")
-LOG_FILE = os.path.expanduser(os.getenv(
+LOG_LEVEL = _str("CLAUDE_CONTINUE_LOG_LEVEL", "INFO")
+LOG_FILE = os.path.expanduser(_str(
     "CLAUDE_CONTINUE_LOG_FILE",
     "~/Library/Logs/claude-continue.log"
 ))
 # Default to file-only logging to keep the terminal clean.
-LOG_TO_CONSOLE = os.getenv("CLAUDE_CONTINUE_LOG_CONSOLE", "false").lower() == "true"
+LOG_TO_CONSOLE = _bool("CLAUDE_CONTINUE_LOG_CONSOLE", False)
 
 # =============================================================================
 # DEBUG MODE
 # =============================================================================
-DEBUG = os.getenv("CLAUDE_CONTINUE_DEBUG", "false").lower() == "true"
+DEBUG = _bool("CLAUDE_CONTINUE_DEBUG", False)
@@ -0,0 +1,30 @@
+"""
+Follow-up prompt data for claude-continue.
+
+Kept in its own module so the main config never pays for this constant
+unless AUTO_FOLLOWUP is actually used - it is loaded lazily on the first
+call to config.next_followup().
+"""
+
+# Follow-up prompts to send when Claude is idle (rotated randomly)
+# NOTE: These are marked [AUTO] to indicate automated messages
+# Be cautious - these can trigger unwanted actions!
+FOLLOWUP_PROMPTS = (
+    # Gentle continuation prompts (safest)
+    "[AUTO] What's the current status? Please summarize without taking action.",
+    "[AUTO] Are there any pending tasks? List them but wait for confirmation before proceeding.",
+    "[AUTO] What would be the next logical step? Describe it but don't execute yet.",
+
+    # Status checks (read-only, safe)
+    "[AUTO] Can you show me the current todo list status?",
+    "[AUTO] What files have been modified in this session?",
+    "[AUTO] Summarize what we've accomplished so far.",
+
+    # Deep thinking (safe - just asks to think)
+    "[AUTO] Think step by step about potential edge cases we might have missed.",
+    "[AUTO] What are the risks or potential issues with the current approach?",
+
+    # Clarification (safe - asks for info)
+    "[AUTO] Is there anything unclear that needs clarification before continuing?",
+    "[AUTO] What assumptions are we making that should be verified?",
+)
@@ -6,27 +6,126 @@ Implements a 3-tier decision system:
 - Tier 2 (Learned): UCB recommendations from past experiences (no API)
 - Tier 3 (LLM): DeepSeek for complex/stuck situations (rate-limited)
 """
+import asyncio
+import hashlib
 import json
 import logging
-from enum import Enum
+import sys
+import threading
+from enum import IntEnum
 from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Any, Tuple
 
 from ..smart_responder import SmartResponder, SmartResponse
 from ..deepseek_client import deepseek_client
 
+# orjson parses LLM JSON payloads several times faster than stdlib json;
+# fall back silently when it isn't installed (it's an optional extra).
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Interned action vocabulary.  Decisions draw action_type/action_value from
+# this tiny fixed set, so sharing one interned str per value keeps equality
+# checks downstream on the pointer-compare fast path and avoids allocating
+# fresh literals per Decision.
+ACTION_APPROVE = sys.intern("approve")
+ACTION_DENY = sys.intern("deny")
+ACTION_CONTINUE = sys.intern("continue")
+ACTION_RESPOND = sys.intern("respond")
+ACTION_WAIT = sys.intern("wait")
+VALUE_YES = sys.intern("1")
+VALUE_NO = sys.intern("2")
+VALUE_CONTINUE = sys.intern("continue")
+VALUE_EMPTY = sys.intern("")
+
+# action_value → action_type dispatch used by Tier-2 inference; one dict
+# hit replaces the old if/elif chain of string comparisons.
+_ACTION_TYPE_MAP = {
+    VALUE_YES: ACTION_APPROVE,
+    VALUE_NO: ACTION_DENY,
+    VALUE_CONTINUE: ACTION_CONTINUE,
+    sys.intern("yes"): ACTION_CONTINUE,
+}
+
+# Shared background event loop for sync Tier-3 LLM calls.  Started lazily on
+# a daemon thread so loop setup (and aiohttp connection reuse) is amortized
+# over the process lifetime instead of paying asyncio.run teardown per call.
+_bg_loop: Optional[asyncio.AbstractEventLoop] = None
+_bg_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting it on first use."""
+    global _bg_loop
+    with _bg_loop_lock:
+        if _bg_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="decision-llm-loop", daemon=True
+            ).start()
+            _bg_loop = loop
+    return _bg_loop
+
+
+# Static Tier-3 prompt template, built once at import instead of being
+# re-assembled by f-string opcodes on every LLM call.
+_LLM_PROMPT_TMPL = """You are an AI agent controlling a Claude Code session.
+{goal_section}
+A {prompt_type} prompt has appeared in the terminal.
+
+Terminal context (last lines):
+{context_tail}
+
+Prompt detected:
+{prompt_text}
+
+Decide how to respond. Return JSON only:
+{{
+    "action_type": "approve|deny|respond|continue|wait|replan",
+    "action_value": "your response (e.g., '1' for approve, '2' for deny, or text)",
+    "confidence": 0.0-1.0,
+    "reason": "brief explanation",
+    "goal_relevance": 0.0-1.0 (how relevant is this to achieving the goal)
+}}
+
+Guidelines:
+- For permission prompts: "1" = Yes/approve, "2" = No/deny
+- For questions: provide a helpful answer
+- For continuations: "continue" or specific guidance
+- Use "replan" if current approach isn't working
+- Use "wait" if user input is needed
+
+Respond with JSON only, no markdown."""
+
+
+class DecisionTier(IntEnum):
+    """Which tier made the decision.
+
+    IntEnum so hot-path comparisons are C-level int compares; the wire
+    names used in logs and to_dict live in TIER_NAME below.
+    """
+    FALLBACK = 0                 # Default fallback
+    TIER_1_RULES = 1             # Rule-based (fast, no API)
+    TIER_2_UCB = 2               # UCB recommendations (learned, no API)
+    TIER_3_LLM = 3               # DeepSeek LLM (slow, rate-limited)
+
 
-class DecisionTier(Enum):
-    """Which tier made the decision."""
-    TIER_1_RULES = "rules"       # Rule-based (fast, no API)
-    TIER_2_UCB = "ucb"           # UCB recommendations (learned, no API)
-    TIER_3_LLM = "llm"           # DeepSeek LLM (slow, rate-limited)
-    FALLBACK = "fallback"        # Default fallback
+# Precomputed tier → serialized name map (one dict hit instead of the
+# Enum.value descriptor per serialized decision)
+TIER_NAME = {
+    DecisionTier.FALLBACK: "fallback",
+    DecisionTier.TIER_1_RULES: "rules",
+    DecisionTier.TIER_2_UCB: "ucb",
+    DecisionTier.TIER_3_LLM: "llm",
+}
 
 
-@dataclass
+@dataclass(slots=True)
 class Decision:
     """A decision made by the agent."""
     action_type: str             # "approve", "deny", "respond", "continue", "wait", "replan"
@@ -45,7 +144,7 @@ class Decision:
             "action_type": self.action_type,
             "action_value": self.action_value,
             "confidence": self.confidence,
-            "tier": self.tier.value,
+            "tier": TIER_NAME[self.tier],
             "reason": self.reason,
             "context_hash": self.context_hash,
             "goal_relevance": self.goal_relevance,
@@ -67,9 +166,17 @@ class DecisionModule:
     # Stuck threshold for escalating to Tier 3
     STUCK_THRESHOLD = 3  # 3 similar observations = stuck
 
+    # Max memoized Tier 1 outcomes before the cache is reset
+    TIER_1_CACHE_SIZE = 256
+
     def __init__(self):
         self._smart_responder = SmartResponder()
         self._ucb_recommendations: Dict[str, List[Tuple[str, float]]] = {}
+        # (prompt_type, prompt_text[:100], hash(context)) → Decision field
+        # tuple (or () for no decision).  Identical prompts recur across
+        # sessions, so this collapses the regex-heavy rule evaluation to a
+        # dict hit on repeats.
+        self._tier1_cache: Dict[Tuple[str, str, int], Tuple] = {}
         logger.info("DecisionModule initialized")
 
     def set_ucb_recommendations(self, recommendations: Dict[str, List[Tuple[str, float]]]):
@@ -81,6 +188,21 @@ class DecisionModule:
         """
         self._ucb_recommendations = recommendations
 
+    def update_ucb_recommendations(
+        self, context_hash: str, recommendations: List[Tuple[str, float]]
+    ):
+        """
+        Update UCB recommendations for a single context.
+
+        Args:
+            context_hash: The context whose scores changed
+            recommendations: [(action, ucb_score), ...] for that context
+        """
+        if recommendations:
+            self._ucb_recommendations[context_hash] = recommendations
+        else:
+            self._ucb_recommendations.pop(context_hash, None)
+
     def decide(
         self,
         prompt_type: str,
@@ -93,7 +215,10 @@ class DecisionModule:
         """
         Make a decision about how to respond to a prompt.
 
-        Goes through tiers until a confident decision is found.
+        Sync wrapper around decide_async() - the tier logic lives there so
+        both entry points share one implementation. Runs the coroutine on
+        the shared background loop; must not be called from async code
+        (use decide_async directly).
 
         Args:
             prompt_type: Type of prompt (permission, question, continuation, completed)
@@ -106,39 +231,27 @@ class DecisionModule:
         Returns:
             Decision object with action and metadata
         """
-        context_hash = self._hash_context(prompt_type, prompt_text)
-
-        # Tier 1: Rule-based decisions
-        tier1_decision = self._tier1_rules(prompt_type, prompt_text, context)
-        if tier1_decision and tier1_decision.confidence >= self.TIER_1_CONFIDENCE_THRESHOLD:
-            tier1_decision.context_hash = context_hash
-            logger.debug(f"Tier 1 decision: {tier1_decision.action_value} ({tier1_decision.confidence:.0%})")
-            return tier1_decision
-
-        # Tier 2: UCB recommendations
-        tier2_decision = self._tier2_ucb(context_hash, prompt_type)
-        if tier2_decision and tier2_decision.confidence >= 0.6:
-            tier2_decision.context_hash = context_hash
-            logger.debug(f"Tier 2 UCB decision: {tier2_decision.action_value} ({tier2_decision.confidence:.0%})")
-            return tier2_decision
-
-        # Tier 3: LLM decision (only if stuck or low confidence)
-        if is_stuck or similar_count >= self.STUCK_THRESHOLD:
-            tier3_decision = self._tier3_llm(
-                prompt_type, prompt_text, context, goal_description
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "decide() called from async context - use decide_async() instead"
             )
-            if tier3_decision:
-                tier3_decision.context_hash = context_hash
-                logger.info(f"Tier 3 LLM decision: {tier3_decision.action_value}")
-                return tier3_decision
-
-        # Fallback: Use Tier 1 with lower threshold or default
-        if tier1_decision:
-            tier1_decision.context_hash = context_hash
-            return tier1_decision
 
-        # Ultimate fallback
-        return self._fallback_decision(prompt_type, context_hash)
+        future = asyncio.run_coroutine_threadsafe(
+            self.decide_async(
+                prompt_type=prompt_type,
+                prompt_text=prompt_text,
+                context=context,
+                goal_description=goal_description,
+                is_stuck=is_stuck,
+                similar_count=similar_count,
+            ),
+            _background_loop(),
+        )
+        return future.result(timeout=60)
 
     def _tier1_rules(
         self,
@@ -148,15 +261,49 @@ class DecisionModule:
     ) -> Optional[Decision]:
         """
         Tier 1: Rule-based decisions using SmartResponder patterns.
+
+        Memoized on (prompt_type, prompt text prefix, full-context hash);
+        the full context hash keeps safety checks exact - a different
+        screen never reuses another screen's approval. Cached entries are
+        stored as field tuples and rebuilt into fresh Decision objects so
+        callers can mutate context_hash safely.
         """
+        key = (prompt_type, prompt_text[:100], hash(context))
+        cached = self._tier1_cache.get(key)
+        if cached is not None:
+            return Decision(*cached) if cached else None
+
+        decision = self._tier1_rules_impl(prompt_type, prompt_text, context)
+        if len(self._tier1_cache) >= self.TIER_1_CACHE_SIZE:
+            self._tier1_cache.clear()
+        self._tier1_cache[key] = (
+            (
+                decision.action_type,
+                decision.action_value,
+                decision.confidence,
+                decision.tier,
+                decision.reason,
+            )
+            if decision
+            else ()
+        )
+        return decision
+
+    def _tier1_rules_impl(
+        self,
+        prompt_type: str,
+        prompt_text: str,
+        context: str,
+    ) -> Optional[Decision]:
+        """Uncached Tier 1 rule evaluation."""
         if prompt_type == "permission":
             # Permission prompts get Yes/No based on action safety
             approved, confidence, reason = self._smart_responder.should_approve_action(
                 f"{prompt_text}\n{context}"
             )
             return Decision(
-                action_type="approve" if approved else "deny",
-                action_value="1" if approved else "2",
+                action_type=ACTION_APPROVE if approved else ACTION_DENY,
+                action_value=VALUE_YES if approved else VALUE_NO,
                 confidence=confidence,
                 tier=DecisionTier.TIER_1_RULES,
                 reason=reason,
@@ -165,8 +312,8 @@ class DecisionModule:
         elif prompt_type == "continuation":
             # Continuation prompts almost always get "continue"
             return Decision(
-                action_type="continue",
-                action_value="continue",
+                action_type=ACTION_CONTINUE,
+                action_value=VALUE_CONTINUE,
                 confidence=0.9,
                 tier=DecisionTier.TIER_1_RULES,
                 reason="Continuation prompt - default continue",
@@ -176,7 +323,7 @@ class DecisionModule:
             # Questions use pattern matching
             response = self._smart_responder.answer_question(prompt_text, context)
             return Decision(
-                action_type="respond",
+                action_type=ACTION_RESPOND,
                 action_value=response.response,
                 confidence=response.confidence,
                 tier=DecisionTier.TIER_1_RULES,
@@ -186,8 +333,8 @@ class DecisionModule:
         elif prompt_type == "completed":
             # Completion - could wait for user or generate follow-up
             return Decision(
-                action_type="wait",
-                action_value="",
+                action_type=ACTION_WAIT,
+                action_value=VALUE_EMPTY,
                 confidence=0.6,
                 tier=DecisionTier.TIER_1_RULES,
                 reason="Task appears completed - waiting for user",
@@ -203,14 +350,12 @@ class DecisionModule:
         """
         Tier 2: UCB-based recommendations from learning module.
         """
-        if context_hash not in self._ucb_recommendations:
-            return None
-
-        recommendations = self._ucb_recommendations[context_hash]
+        recommendations = self._ucb_recommendations.get(context_hash)
         if not recommendations:
             return None
 
-        # Get best action by UCB score
+        # Get best action by UCB score (lists arrive pre-sorted descending
+        # from LearningModule.get_recommendations)
         best_action, best_score = recommendations[0]
 
         # Convert UCB score to confidence (UCB scores are typically > 1)
@@ -224,65 +369,6 @@ class DecisionModule:
             reason=f"UCB recommendation (score: {best_score:.2f})",
         )
 
-    def _tier3_llm(
-        self,
-        prompt_type: str,
-        prompt_text: str,
-        context: str,
-        goal_description: Optional[str],
-    ) -> Optional[Decision]:
-        """
-        Tier 3: LLM-based decisions using DeepSeek.
-
-        Only called when stuck or unable to make confident decision.
-        Rate-limited to 5 calls/hour.
-        """
-        if not deepseek_client.can_call:
-            logger.debug("Tier 3 skipped - DeepSeek rate limited or unavailable")
-            return None
-
-        # Build prompt for LLM
-        prompt = self._build_llm_prompt(prompt_type, prompt_text, context, goal_description)
-
-        try:
-            # Note: This is synchronous - will be called from async context
-            # In production, we'd want to handle this better
-            import asyncio
-
-            # Try to get running loop, or create new one
-            try:
-                loop = asyncio.get_running_loop()
-                # We're in async context - can't call sync here
-                # Return None and let caller handle async
-                logger.debug("Tier 3 skipped - already in async context")
-                return None
-            except RuntimeError:
-                # No running loop - safe to create one
-                response = asyncio.run(
-                    deepseek_client._call_api(prompt)  # Direct API call
-                )
-
-            if not response:
-                return None
-
-            # Parse JSON response
-            decision_data = self._parse_llm_response(response)
-            if not decision_data:
-                return None
-
-            return Decision(
-                action_type=decision_data.get("action_type", "respond"),
-                action_value=decision_data.get("action_value", ""),
-                confidence=float(decision_data.get("confidence", 0.7)),
-                tier=DecisionTier.TIER_3_LLM,
-                reason=decision_data.get("reason", "LLM decision"),
-                goal_relevance=float(decision_data.get("goal_relevance", 0.5)),
-            )
-
-        except Exception as e:
-            logger.error(f"Tier 3 LLM decision failed: {e}")
-            return None
-
     async def decide_async(
         self,
         prompt_type: str,
@@ -293,36 +379,43 @@ class DecisionModule:
         similar_count: int = 0,
     ) -> Decision:
         """
-        Async version of decide() - supports LLM calls in async context.
+        Canonical decision implementation - goes through tiers until a
+        confident decision is found. See decide() for the sync wrapper.
         """
-        context_hash = self._hash_context(prompt_type, prompt_text)
-
-        # Tier 1: Rule-based decisions
+        # Tier 1: Rule-based decisions.  The dominant path - returns before
+        # the context hash is computed; nothing downstream reads it for
+        # confident Tier 1 decisions.
         tier1_decision = self._tier1_rules(prompt_type, prompt_text, context)
         if tier1_decision and tier1_decision.confidence >= self.TIER_1_CONFIDENCE_THRESHOLD:
-            tier1_decision.context_hash = context_hash
+            logger.debug(f"Tier 1 decision: {tier1_decision.action_value} ({tier1_decision.confidence:.0%})")
             return tier1_decision
 
+        # Tier 2 onward needs the context hash for UCB lookup / learning
+        context_hash = self._hash_context(prompt_type, prompt_text)
+
         # Tier 2: UCB recommendations
         tier2_decision = self._tier2_ucb(context_hash, prompt_type)
         if tier2_decision and tier2_decision.confidence >= 0.6:
             tier2_decision.context_hash = context_hash
+            logger.debug(f"Tier 2 UCB decision: {tier2_decision.action_value} ({tier2_decision.confidence:.0%})")
             return tier2_decision
 
-        # Tier 3: LLM decision (async)
+        # Tier 3: LLM decision (only if stuck or low confidence)
         if is_stuck or similar_count >= self.STUCK_THRESHOLD:
             tier3_decision = await self._tier3_llm_async(
                 prompt_type, prompt_text, context, goal_description
             )
             if tier3_decision:
                 tier3_decision.context_hash = context_hash
+                logger.info(f"Tier 3 LLM decision: {tier3_decision.action_value}")
                 return tier3_decision
 
-        # Fallback
+        # Fallback: Use Tier 1 with lower threshold or default
         if tier1_decision:
             tier1_decision.context_hash = context_hash
             return tier1_decision
 
+        # Ultimate fallback
         return self._fallback_decision(prompt_type, context_hash)
 
     async def _tier3_llm_async(
@@ -364,8 +457,8 @@ class DecisionModule:
         if prompt_type == "permission":
             # Default approve with low confidence
             return Decision(
-                action_type="approve",
-                action_value="1",
+                action_type=ACTION_APPROVE,
+                action_value=VALUE_YES,
                 confidence=0.3,
                 tier=DecisionTier.FALLBACK,
                 reason="Fallback: default approve",
@@ -373,8 +466,8 @@ class DecisionModule:
             )
         elif prompt_type == "continuation":
             return Decision(
-                action_type="continue",
-                action_value="continue",
+                action_type=ACTION_CONTINUE,
+                action_value=VALUE_CONTINUE,
                 confidence=0.5,
                 tier=DecisionTier.FALLBACK,
                 reason="Fallback: default continue",
@@ -383,8 +476,8 @@ class DecisionModule:
         else:
             # Wait for user
             return Decision(
-                action_type="wait",
-                action_value="",
+                action_type=ACTION_WAIT,
+                action_value=VALUE_EMPTY,
                 confidence=0.2,
                 tier=DecisionTier.FALLBACK,
                 reason="Fallback: waiting for user",
@@ -403,33 +496,12 @@ class DecisionModule:
         if goal_description:
             goal_section = f"\nCurrent Goal: {goal_description}\n"
 
-        return f"""You are an AI agent controlling a Claude Code session.
-{goal_section}
-A {prompt_type} prompt has appeared in the terminal.
-
-Terminal context (last lines):
-{context[-1500:]}
-
-Prompt detected:
-{prompt_text}
-
-Decide how to respond. Return JSON only:
-{{
-    "action_type": "approve|deny|respond|continue|wait|replan",
-    "action_value": "your response (e.g., '1' for approve, '2' for deny, or text)",
-    "confidence": 0.0-1.0,
-    "reason": "brief explanation",
-    "goal_relevance": 0.0-1.0 (how relevant is this to achieving the goal)
-}}
-
-Guidelines:
-- For permission prompts: "1" = Yes/approve, "2" = No/deny
-- For questions: provide a helpful answer
-- For continuations: "continue" or specific guidance
-- Use "replan" if current approach isn't working
-- Use "wait" if user input is needed
-
-Respond with JSON only, no markdown."""
+        return _LLM_PROMPT_TMPL.format(
+            goal_section=goal_section,
+            prompt_type=prompt_type,
+            context_tail=context[-1500:],
+            prompt_text=prompt_text,
+        )
 
     def _parse_llm_response(self, response: str) -> Optional[Dict[str, Any]]:
         """Parse JSON response from LLM."""
@@ -437,34 +509,42 @@ Respond with JSON only, no markdown."""
             # Try to find JSON in response
             response = response.strip()
 
-            # Remove markdown code blocks if present
+            # Remove markdown code blocks if present - slice between the
+            # first and last newline instead of allocating a split list
+            # and re-joining
             if response.startswith("```"):
-                lines = response.split("\n")
-                response = "\n".join(lines[1:-1])
+                first_nl = response.find("\n")
+                last_nl = response.rfind("\n")
+                if first_nl != -1 and last_nl > first_nl:
+                    response = response[first_nl + 1:last_nl]
 
-            return json.loads(response)
+            return _json_loads(response)
         except json.JSONDecodeError:
             logger.warning(f"Failed to parse LLM response as JSON: {response[:100]}")
             return None
 
     def _hash_context(self, prompt_type: str, prompt_text: str) -> str:
-        """Create a hash of the context for experience matching."""
-        import hashlib
+        """Create a hash of the context for experience matching.
+
+        Uses BLAKE2b with an 8-byte digest: stable across restarts (the
+        learning module persists experiences keyed by this hash) and much
+        cheaper per call than MD5 on these short inputs, while producing
+        the same 16-hex-char format as the old truncated MD5.
+        """
         content = f"{prompt_type}:{prompt_text[:100]}"
-        return hashlib.md5(content.encode()).hexdigest()[:16]
+        return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
 
     def _infer_action_type(self, action_value: str, prompt_type: str) -> str:
-        """Infer action type from action value."""
-        if action_value == "1":
-            return "approve"
-        elif action_value == "2":
-            return "deny"
-        elif action_value.lower() in ("continue", "yes"):
-            return "continue"
-        elif prompt_type == "permission":
-            return "approve" if action_value == "1" else "deny"
-        else:
-            return "respond"
+        """Infer action type from action value via dict dispatch."""
+        action_type = _ACTION_TYPE_MAP.get(action_value)
+        if action_type is None and action_value not in ("1", "2"):
+            # Case-insensitive retry for textual values ("Continue", "Yes")
+            action_type = _ACTION_TYPE_MAP.get(action_value.lower())
+        if action_type is not None:
+            return action_type
+        # "1" is already mapped above, so an unmapped permission value
+        # can only mean deny
+        return ACTION_DENY if prompt_type == "permission" else ACTION_RESPOND
 
 
 # Global instance
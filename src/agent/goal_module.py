@@ -8,16 +8,54 @@ Features:
 - Persistent storage (~/.claude-continue/goals/)
 """
 import json
+import os
+import threading
 import time
 import uuid
+import weakref
 import logging
 from enum import Enum
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Set
+
+# Goals are rewritten on every mutation; prefer the C encoder when present.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize to JSON bytes, via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(obj, indent=2 if pretty else None).encode()
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Write via temp file + rename so readers never see a torn file."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
 
 logger = logging.getLogger(__name__)
 
+# strftime result cached per wall-clock minute; progress notes only
+# carry HH:MM so one format per minute is enough
+_MINUTE_CACHE = [0, ""]
+
+
+def _hhmm() -> str:
+    """Current HH:MM, reformatted only when the minute changes."""
+    now_m = int(time.time() // 60)
+    if now_m != _MINUTE_CACHE[0]:
+        _MINUTE_CACHE[0] = now_m
+        _MINUTE_CACHE[1] = time.strftime("%H:%M")
+    return _MINUTE_CACHE[1]
+
 
 class GoalStatus(Enum):
     """Goal status states."""
@@ -58,21 +96,53 @@ class Goal:
     tags: List[str] = field(default_factory=list)
     priority: int = 1            # 1 (low) to 5 (critical)
 
+    # Set mirror of subgoal_ids for O(1) membership checks; the list
+    # keeps the stable order used for serialization
+    _subgoal_set: Set[str] = field(default_factory=set, init=False, repr=False)
+
+    # Set by GoalModule so status transitions keep its active-goal index
+    # current even when callers mutate the Goal directly
+    _on_status_change: Optional[Any] = field(default=None, init=False, repr=False)
+
+    # Memoized to_dict result, invalidated by mutators; duration_seconds
+    # is refreshed on every call since it tracks wall time
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _cache_dirty: bool = field(default=True, init=False, repr=False)
+
+    # Running count of met criteria so progress_percent skips summing
+    # the criteria_met list
+    _criteria_met_count: int = field(default=0, init=False, repr=False)
+
+    # Cached progress value, recomputed only after a relevant mutation
+    _pp_cache: float = field(default=0.0, init=False, repr=False)
+    _pp_dirty: bool = field(default=True, init=False, repr=False)
+
     def __post_init__(self):
         """Initialize criteria_met list."""
         if self.success_criteria and not self.criteria_met:
             self.criteria_met = [False] * len(self.success_criteria)
+        self._subgoal_set = set(self.subgoal_ids)
+        self._criteria_met_count = sum(self.criteria_met)
+
+    def _notify_status(self):
+        """Tell the owning GoalModule about a status transition."""
+        self._cache_dirty = True
+        self._pp_dirty = True
+        if self._on_status_change is not None:
+            self._on_status_change(self)
 
     def start(self):
         """Mark goal as started."""
         self.status = GoalStatus.ACTIVE
         self.started_at = time.time()
+        self._notify_status()
         logger.info(f"Goal {self.goal_id[:8]} started: {self.description[:50]}")
 
     def complete(self, notes: Optional[str] = None):
         """Mark goal as completed."""
         self.status = GoalStatus.COMPLETED
         self.completed_at = time.time()
+        self._notify_status()
         if notes:
             self.progress_notes.append(f"[COMPLETED] {notes}")
         logger.info(f"Goal {self.goal_id[:8]} completed: {self.description[:50]}")
@@ -81,12 +151,14 @@ class Goal:
         """Mark goal as failed."""
         self.status = GoalStatus.FAILED
         self.completed_at = time.time()
+        self._notify_status()
         self.progress_notes.append(f"[FAILED] {reason}")
         logger.warning(f"Goal {self.goal_id[:8]} failed: {reason}")
 
     def pause(self, reason: Optional[str] = None):
         """Pause the goal."""
         self.status = GoalStatus.PAUSED
+        self._notify_status()
         if reason:
             self.progress_notes.append(f"[PAUSED] {reason}")
 
@@ -94,21 +166,29 @@ class Goal:
         """Resume a paused goal."""
         if self.status == GoalStatus.PAUSED:
             self.status = GoalStatus.ACTIVE
+            self._notify_status()
             self.progress_notes.append("[RESUMED]")
 
     def add_progress(self, note: str):
         """Add a progress note."""
-        self.progress_notes.append(f"[{time.strftime('%H:%M')}] {note}")
+        self.progress_notes.append(f"[{_hhmm()}] {note}")
+        self._cache_dirty = True
 
     def mark_criterion(self, index: int, met: bool = True):
         """Mark a success criterion as met/unmet."""
         if 0 <= index < len(self.criteria_met):
-            self.criteria_met[index] = met
+            if self.criteria_met[index] != met:
+                self.criteria_met[index] = met
+                self._criteria_met_count += 1 if met else -1
+                self._cache_dirty = True
+                self._pp_dirty = True
 
     def add_subgoal_id(self, subgoal_id: str):
         """Add a subgoal reference."""
-        if subgoal_id not in self.subgoal_ids:
+        if subgoal_id not in self._subgoal_set:
+            self._subgoal_set.add(subgoal_id)
             self.subgoal_ids.append(subgoal_id)
+            self._cache_dirty = True
 
     @property
     def is_active(self) -> bool:
@@ -122,10 +202,17 @@ class Goal:
 
     @property
     def progress_percent(self) -> float:
-        """Calculate progress percentage."""
+        """Calculate progress percentage (cached between mutations)."""
+        if self._pp_dirty:
+            self._pp_cache = self._compute_progress()
+            self._pp_dirty = False
+        return self._pp_cache
+
+    def _compute_progress(self) -> float:
+        """Recompute the progress percentage from criteria and steps."""
         # Based on success criteria
         if self.criteria_met:
-            criteria_progress = sum(self.criteria_met) / len(self.criteria_met)
+            criteria_progress = self._criteria_met_count / len(self.criteria_met)
         else:
             criteria_progress = 0
 
@@ -153,8 +240,8 @@ class Goal:
         end = self.completed_at or time.time()
         return end - self.started_at
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
+    def to_persist_dict(self) -> Dict[str, Any]:
+        """Dict for storage - omits derived fields from_dict rebuilds."""
         return {
             "goal_id": self.goal_id,
             "session_id": self.session_id,
@@ -172,10 +259,21 @@ class Goal:
             "completed_steps": self.completed_steps,
             "tags": self.tags,
             "priority": self.priority,
-            "progress_percent": self.progress_percent,
-            "duration_seconds": self.duration_seconds,
         }
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for the API, with derived fields."""
+        if self._dict_cache is not None and not self._cache_dirty:
+            # Only duration moves without a mutation
+            self._dict_cache["duration_seconds"] = self.duration_seconds
+            return self._dict_cache
+
+        self._cache_dirty = False
+        self._dict_cache = self.to_persist_dict()
+        self._dict_cache["progress_percent"] = self.progress_percent
+        self._dict_cache["duration_seconds"] = self.duration_seconds
+        return self._dict_cache
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Goal":
         """Create Goal from dictionary."""
@@ -202,6 +300,13 @@ class Goal:
         )
 
 
+def _flush_on_shutdown(module_ref):
+    """Flush a still-live GoalModule on interpreter exit."""
+    module = module_ref()
+    if module is not None:
+        module.flush()
+
+
 class GoalModule:
     """
     Manages goals for all sessions.
@@ -210,10 +315,25 @@ class GoalModule:
     Goals persist across daemon restarts via JSON storage.
     """
 
+    # Minimum seconds between opportunistic flushes of dirty goals
+    FLUSH_INTERVAL = 1.0
+
     def __init__(self, storage_dir: Optional[Path] = None):
         """Initialize with optional custom storage directory."""
         self._goals: Dict[str, Goal] = {}  # goal_id → Goal
-        self._session_goals: Dict[str, List[str]] = {}  # session_id → [goal_ids]
+        # session_id → {goal_id: None}; dict keys give O(1) membership
+        # while preserving insertion order
+        self._session_goals: Dict[str, Dict[str, None]] = {}
+
+        # session_id → goal_id of the highest-priority active goal,
+        # maintained on status transitions so get_active_goal is O(1)
+        self._active_by_session: Dict[str, str] = {}
+
+        # Goals awaiting persistence - mutations mark goals dirty and the
+        # file write happens at most once per FLUSH_INTERVAL, so a burst
+        # of progress notes costs one rewrite instead of one per note.
+        self._dirty: set = set()
+        self._last_flush = 0.0
 
         # Storage setup
         if storage_dir:
@@ -222,9 +342,29 @@ class GoalModule:
             self._storage_dir = Path.home() / ".claude-continue" / "goals"
 
         self._storage_dir.mkdir(parents=True, exist_ok=True)
-        self._load_goals()
 
-        logger.info(f"GoalModule initialized with {len(self._goals)} goals")
+        # Persisted goals are loaded lazily on first use so importing the
+        # agent package doesn't block on disk I/O
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+        # Make sure pending writes land on process exit. weakref.finalize
+        # (unlike atexit.register(self.flush)) doesn't pin the instance, so
+        # short-lived modules in tests are collected normally
+        weakref.finalize(self, _flush_on_shutdown, weakref.ref(self))
+
+        logger.info(f"GoalModule initialized (storage: {self._storage_dir})")
+
+    def _ensure_loaded(self):
+        """Load persisted goals on first access."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            self._load_goals()
+            self._loaded = True
+            logger.info(f"GoalModule loaded {len(self._goals)} goals")
 
     def create_goal(
         self,
@@ -236,6 +376,7 @@ class GoalModule:
         tags: Optional[List[str]] = None,
     ) -> Goal:
         """Create a new goal for a session."""
+        self._ensure_loaded()
         goal_id = str(uuid.uuid4())
 
         goal = Goal(
@@ -249,65 +390,111 @@ class GoalModule:
         )
 
         # Store goal
+        goal._on_status_change = self._on_goal_status
         self._goals[goal_id] = goal
 
         # Track session → goals mapping
-        if session_id not in self._session_goals:
-            self._session_goals[session_id] = []
-        self._session_goals[session_id].append(goal_id)
+        self._session_goals.setdefault(session_id, {})[goal_id] = None
 
         # Link to parent if subgoal
         if parent_id and parent_id in self._goals:
             self._goals[parent_id].add_subgoal_id(goal_id)
 
         # Persist
-        self._save_goal(goal)
+        self._mark_dirty(goal)
 
         logger.info(f"Created goal {goal_id[:8]} for session {session_id[:8]}: {description[:50]}")
         return goal
 
     def get_goal(self, goal_id: str) -> Optional[Goal]:
         """Get a goal by ID."""
+        self._ensure_loaded()
         return self._goals.get(goal_id)
 
     def get_session_goals(self, session_id: str) -> List[Goal]:
         """Get all goals for a session."""
-        goal_ids = self._session_goals.get(session_id, [])
+        self._ensure_loaded()
+        goal_ids = self._session_goals.get(session_id, ())
         return [self._goals[gid] for gid in goal_ids if gid in self._goals]
 
     def get_active_goal(self, session_id: str) -> Optional[Goal]:
         """Get the currently active goal for a session."""
-        goals = self.get_session_goals(session_id)
-        active = [g for g in goals if g.is_active]
-
-        # Return highest priority active goal
-        if active:
-            return max(active, key=lambda g: g.priority)
+        self._ensure_loaded()
+        goal_id = self._active_by_session.get(session_id)
+        if goal_id:
+            goal = self._goals.get(goal_id)
+            if goal and goal.is_active:
+                return goal
         return None
 
+    def _on_goal_status(self, goal: Goal):
+        """Keep the per-session active-goal index in sync on transitions."""
+        session_id = goal.session_id
+        if goal.is_active:
+            current = self._goals.get(self._active_by_session.get(session_id, ""))
+            if current is None or not current.is_active or goal.priority > current.priority:
+                self._active_by_session[session_id] = goal.goal_id
+        elif self._active_by_session.get(session_id) == goal.goal_id:
+            # The pointer goal left ACTIVE - fall back to the best remaining
+            del self._active_by_session[session_id]
+            active = [g for g in self.get_session_goals(session_id) if g.is_active]
+            if active:
+                self._active_by_session[session_id] = max(
+                    active, key=lambda g: g.priority
+                ).goal_id
+
     def update_goal(self, goal: Goal):
         """Update and persist a goal."""
+        self._ensure_loaded()
         if goal.goal_id in self._goals:
+            goal._on_status_change = self._on_goal_status
             self._goals[goal.goal_id] = goal
-            self._save_goal(goal)
+            self._mark_dirty(goal)
 
     def complete_goal(self, goal_id: str, notes: Optional[str] = None):
         """Mark a goal as completed."""
         goal = self.get_goal(goal_id)
         if goal:
             goal.complete(notes)
-            self._save_goal(goal)
+            self._mark_dirty(goal)
 
     def fail_goal(self, goal_id: str, reason: str):
         """Mark a goal as failed."""
         goal = self.get_goal(goal_id)
         if goal:
             goal.fail(reason)
-            self._save_goal(goal)
+            self._mark_dirty(goal)
+
+    def _mark_dirty(self, goal: Goal):
+        """Queue a goal for persistence and flush if the interval elapsed."""
+        # Callers that assign fields directly (e.g. completed_steps) reach
+        # us via update_goal, so this also invalidates the caches
+        goal._cache_dirty = True
+        goal._pp_dirty = True
+        self._dirty.add(goal.goal_id)
+        if time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Write all dirty goals to storage."""
+        self._last_flush = time.monotonic()
+        if not self._storage_dir.is_dir():
+            # Storage was removed under us (e.g. test teardown) - there is
+            # nowhere to write, so drop the pending saves quietly
+            self._dirty.clear()
+            return
+        while self._dirty:
+            goal = self._goals.get(self._dirty.pop())
+            if goal:
+                self._save_goal(goal)
 
     def remove_session_goals(self, session_id: str):
         """Remove all goals for a session."""
-        goal_ids = self._session_goals.pop(session_id, [])
+        self._ensure_loaded()
+        # Persist any pending state before dropping the goals from memory
+        self.flush()
+        goal_ids = self._session_goals.pop(session_id, ())
+        self._active_by_session.pop(session_id, None)
         for goal_id in goal_ids:
             if goal_id in self._goals:
                 # Don't delete from storage, just from memory
@@ -316,14 +503,14 @@ class GoalModule:
 
     def get_all_goals(self) -> List[Goal]:
         """Get all goals."""
+        self._ensure_loaded()
         return list(self._goals.values())
 
     def _save_goal(self, goal: Goal):
         """Save a goal to storage."""
         path = self._storage_dir / f"{goal.goal_id}.json"
         try:
-            with open(path, "w") as f:
-                json.dump(goal.to_dict(), f, indent=2)
+            _atomic_write(path, _dumps(goal.to_persist_dict()))
         except Exception as e:
             logger.error(f"Failed to save goal {goal.goal_id[:8]}: {e}")
 
@@ -337,16 +524,18 @@ class GoalModule:
 
                     # Only load non-completed goals (keep history small)
                     if not goal.is_done:
+                        goal._on_status_change = self._on_goal_status
                         self._goals[goal.goal_id] = goal
-                        if goal.session_id not in self._session_goals:
-                            self._session_goals[goal.session_id] = []
-                        self._session_goals[goal.session_id].append(goal.goal_id)
+                        self._session_goals.setdefault(goal.session_id, {})[goal.goal_id] = None
+                        if goal.is_active:
+                            self._on_goal_status(goal)
 
             except Exception as e:
                 logger.warning(f"Failed to load goal from {path}: {e}")
 
     def get_status(self) -> Dict[str, Any]:
         """Get status for web API."""
+        self._ensure_loaded()
         return {
             "total_goals": len(self._goals),
             "active_goals": sum(1 for g in self._goals.values() if g.is_active),
@@ -357,5 +546,10 @@ class GoalModule:
         }
 
 
-# Global instance
-goal_module = GoalModule()
+# Global instance, created on first attribute access so merely importing
+# the module stays cheap
+def __getattr__(name):
+    if name == "goal_module":
+        instance = globals()["goal_module"] = GoalModule()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,19 +8,52 @@ Features:
 - Persistent storage (~/.claude-continue/learning/)
 - Dense reward shaping based on goal progress
 """
+import bisect
+import heapq
 import json
-import math
+import os
+import re
+import threading
 import time
+import weakref
 import logging
+from array import array
+from math import log, sqrt
 from pathlib import Path
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Any, Tuple
 from collections import defaultdict
 
+# Optional fast JSON encoder - experiences are written once per handled
+# prompt, so the encoder sits on a hot path.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize to JSON bytes, via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(obj, indent=2 if pretty else None).encode()
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Write via temp file + rename so readers never see a torn file."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Experience:
     """A single experience (state, action, outcome, reward)."""
     timestamp: float
@@ -49,15 +82,50 @@ class Experience:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return asdict(self)
+        # All fields are primitives, so a literal beats asdict's
+        # recursive field walk on the per-record save path
+        return {
+            "timestamp": self.timestamp,
+            "session_id": self.session_id,
+            "context_hash": self.context_hash,
+            "prompt_type": self.prompt_type,
+            "prompt_text": self.prompt_text,
+            "action_type": self.action_type,
+            "action_value": self.action_value,
+            "outcome": self.outcome,
+            "outcome_details": self.outcome_details,
+            "reward": self.reward,
+            "goal_id": self.goal_id,
+            "goal_progress_before": self.goal_progress_before,
+            "goal_progress_after": self.goal_progress_after,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Experience":
         """Create from dictionary."""
-        return cls(**data)
-
-
-@dataclass
+        return cls(*(data.get(k, d) for k, d in _EXP_FIELDS))
+
+
+# Experience fields with their defaults, in declaration order, so
+# from_dict can construct positionally instead of via **kwargs expansion
+_EXP_FIELDS = (
+    ("timestamp", 0.0),
+    ("session_id", ""),
+    ("context_hash", ""),
+    ("prompt_type", ""),
+    ("prompt_text", ""),
+    ("action_type", ""),
+    ("action_value", ""),
+    ("outcome", ""),
+    ("outcome_details", None),
+    ("reward", 0.0),
+    ("goal_id", None),
+    ("goal_progress_before", 0.0),
+    ("goal_progress_after", 0.0),
+)
+
+
+@dataclass(slots=True)
 class ActionStats:
     """Statistics for an action in a context."""
     action_value: str
@@ -66,12 +134,9 @@ class ActionStats:
     successes: int = 0
     failures: int = 0
 
-    @property
-    def mean_reward(self) -> float:
-        """Calculate mean reward."""
-        if self.count == 0:
-            return 0.0
-        return self.total_reward / self.count
+    # Maintained on every update so the UCB loop reads a plain attribute
+    # instead of running a property descriptor per action
+    mean_reward: float = 0.0
 
     @property
     def success_rate(self) -> float:
@@ -81,23 +146,28 @@ class ActionStats:
             return 0.5  # Unknown = 50%
         return self.successes / total
 
-    def ucb_score(self, total_count: int, exploration_constant: float = 1.41) -> float:
+    def ucb_score(self, log_total: float, exploration_constant: float = 1.41) -> float:
         """
         Calculate UCB score for this action.
 
         UCB = mean_reward + c * sqrt(ln(total) / count)
 
         Args:
-            total_count: Total number of experiences in this context
+            log_total: ln(total experiences in this context), computed once
+                by the caller and shared across the context's actions
             exploration_constant: c value (default sqrt(2) is theoretically optimal)
         """
         if self.count == 0:
             return float('inf')  # Unexplored actions get priority
 
-        exploitation = self.mean_reward
-        exploration = exploration_constant * math.sqrt(math.log(total_count) / self.count)
+        return self.mean_reward + exploration_constant * sqrt(log_total / self.count)
 
-        return exploitation + exploration
+
+def _close_log_on_shutdown(module_ref):
+    """Close the experience log of a still-live LearningModule on exit."""
+    module = module_ref()
+    if module is not None:
+        module._close_log()
 
 
 class LearningModule:
@@ -117,14 +187,29 @@ class LearningModule:
     # Exploration constant for UCB
     EXPLORATION_CONSTANT = 1.41  # sqrt(2)
 
+    # Cap on experiences kept in memory; disk history is unaffected
+    MAX_IN_MEMORY_EXPERIENCES = 10000
+
     def __init__(self, storage_dir: Optional[Path] = None):
         """Initialize with optional custom storage directory."""
         # Experience storage
         self._experiences: List[Experience] = []
 
-        # Action statistics per context
-        # context_hash → action_value → ActionStats
-        self._action_stats: Dict[str, Dict[str, ActionStats]] = defaultdict(dict)
+        # Parallel C-double array of experience timestamps (arrival order),
+        # so age-based expiry is a bisect + slice instead of a Python
+        # filter over every Experience object
+        self._exp_timestamps = array("d")
+
+        # Action statistics, flat-keyed by (context_hash, action_value)
+        # so the hot update path does a single hash lookup
+        self._action_stats: Dict[Tuple[str, str], ActionStats] = {}
+
+        # context_hash → [action_value, ...] for per-context iteration
+        self._ctx_actions: Dict[str, List[str]] = defaultdict(list)
+
+        # Incrementally maintained experience count per context, so UCB
+        # scoring doesn't re-sum every ActionStats.count on each call
+        self._ctx_totals: Dict[str, int] = defaultdict(int)
 
         # Pending experiences for batch learning
         self._pending_batch: List[Experience] = []
@@ -132,6 +217,13 @@ class LearningModule:
         # Learned patterns (from LLM analysis)
         self._learned_patterns: Dict[str, str] = {}  # pattern → recommended_action
 
+        # Combined alternation over all valid learned patterns, rebuilt
+        # lazily when patterns change - one C-level scan instead of a
+        # Python loop recompiling each pattern per lookup
+        self._combined_pattern: Optional[re.Pattern] = None
+        self._combined_actions: List[str] = []  # named group index → action
+        self._combined_dirty = True
+
         # Storage setup
         if storage_dir:
             self._storage_dir = storage_dir
@@ -139,9 +231,32 @@ class LearningModule:
             self._storage_dir = Path.home() / ".claude-continue" / "learning"
 
         self._storage_dir.mkdir(parents=True, exist_ok=True)
-        self._load_data()
 
-        logger.info(f"LearningModule initialized with {len(self._experiences)} experiences")
+        # History is loaded lazily on first use so importing the agent
+        # package doesn't block on disk I/O
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+        # Long-lived O_APPEND descriptor for today's experience file -
+        # one write syscall per record instead of open/write/close
+        self._log_fd = -1
+        self._log_date = ""
+        # weakref.finalize (unlike atexit.register(self._close_log)) doesn't
+        # pin the instance, so short-lived modules in tests are collected
+        weakref.finalize(self, _close_log_on_shutdown, weakref.ref(self))
+
+        logger.info(f"LearningModule initialized (storage: {self._storage_dir})")
+
+    def _ensure_loaded(self):
+        """Load persisted history on first access."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            self._load_data()
+            self._loaded = True
+            logger.info(f"LearningModule loaded {len(self._experiences)} experiences")
 
     def record_experience(
         self,
@@ -176,6 +291,8 @@ class LearningModule:
         Returns:
             The recorded Experience
         """
+        self._ensure_loaded()
+
         # Calculate reward
         reward = self._calculate_reward(
             outcome, goal_progress_before, goal_progress_after
@@ -199,6 +316,8 @@ class LearningModule:
 
         # Store experience
         self._experiences.append(experience)
+        self._exp_timestamps.append(experience.timestamp)
+        self._trim_to_capacity()
 
         # Update action statistics
         self._update_stats(experience)
@@ -225,20 +344,23 @@ class LearningModule:
         Returns:
             List of (action_value, ucb_score) sorted by score descending
         """
-        if context_hash not in self._action_stats:
+        self._ensure_loaded()
+        actions = self._ctx_actions.get(context_hash)
+        if not actions:
             return []
 
-        stats = self._action_stats[context_hash]
-        total_count = sum(s.count for s in stats.values())
+        total_count = self._ctx_totals[context_hash]
 
         if total_count < self.MIN_EXPERIENCES_PER_CONTEXT:
             return []
 
-        # Calculate UCB scores
-        recommendations = []
-        for action_value, action_stats in stats.items():
-            ucb = action_stats.ucb_score(total_count, self.EXPLORATION_CONSTANT)
-            recommendations.append((action_value, ucb))
+        # Calculate UCB scores; ln(total) is shared by every action
+        log_total = log(total_count)
+        stats = self._action_stats
+        recommendations = [
+            (action, stats[(context_hash, action)].ucb_score(log_total, self.EXPLORATION_CONSTANT))
+            for action in actions
+        ]
 
         # Sort by UCB score descending
         recommendations.sort(key=lambda x: x[1], reverse=True)
@@ -252,9 +374,10 @@ class LearningModule:
         Returns:
             Dict of context_hash → [(action, ucb_score), ...]
         """
+        self._ensure_loaded()
         return {
             ctx: self.get_recommendations(ctx)
-            for ctx in self._action_stats.keys()
+            for ctx in self._ctx_actions.keys()
         }
 
     def should_batch_learn(self) -> bool:
@@ -269,19 +392,49 @@ class LearningModule:
 
     def add_learned_pattern(self, pattern: str, recommended_action: str):
         """Add a pattern learned from LLM analysis."""
+        self._ensure_loaded()
         self._learned_patterns[pattern] = recommended_action
+        self._combined_dirty = True
         self._save_patterns()
 
     def get_learned_pattern(self, context: str) -> Optional[str]:
         """Check if any learned pattern matches the context."""
-        import re
+        self._ensure_loaded()
+        if self._combined_dirty:
+            self._build_combined_pattern()
+
+        if self._combined_pattern is None:
+            return None
+
+        match = self._combined_pattern.search(context)
+        if match and match.lastgroup:
+            return self._combined_actions[int(match.lastgroup[1:])]
+        return None
+
+    def _build_combined_pattern(self):
+        """Union all valid learned patterns into a single compiled regex.
+
+        Each pattern becomes a named group (p0, p1, ...) so lastgroup
+        identifies which one matched. Invalid patterns are skipped, and a
+        pattern that breaks the combined compile is dropped from it.
+        """
+        self._combined_dirty = False
+        groups = []
+        actions = []
         for pattern, action in self._learned_patterns.items():
             try:
-                if re.search(pattern, context, re.IGNORECASE):
-                    return action
+                re.compile(pattern)
+                combined = "|".join(groups + [f"(?P<p{len(actions)}>{pattern})"])
+                re.compile(combined, re.IGNORECASE)
             except re.error:
                 continue
-        return None
+            groups.append(f"(?P<p{len(actions)}>{pattern})")
+            actions.append(action)
+
+        self._combined_actions = actions
+        self._combined_pattern = (
+            re.compile("|".join(groups), re.IGNORECASE) if groups else None
+        )
 
     def _calculate_reward(
         self,
@@ -321,36 +474,66 @@ class LearningModule:
         ctx = experience.context_hash
         action = experience.action_value
 
-        if action not in self._action_stats[ctx]:
-            self._action_stats[ctx][action] = ActionStats(action_value=action)
+        stats = self._action_stats.get((ctx, action))
+        if stats is None:
+            stats = self._action_stats[(ctx, action)] = ActionStats(action_value=action)
+            self._ctx_actions[ctx].append(action)
 
-        stats = self._action_stats[ctx][action]
         stats.count += 1
         stats.total_reward += experience.reward
+        stats.mean_reward = stats.total_reward / stats.count
+        self._ctx_totals[ctx] += 1
 
         if experience.outcome == "success":
             stats.successes += 1
         elif experience.outcome == "failed":
             stats.failures += 1
 
+    def _trim_to_capacity(self):
+        """Bound the in-memory buffer, shedding the oldest experiences.
+
+        Drops the full overflow plus a tenth of the capacity as slack,
+        so the cap actually holds after a large load and the slice cost
+        is amortized rather than paid per record once it's reached.
+        """
+        if len(self._experiences) > self.MAX_IN_MEMORY_EXPERIENCES:
+            slack = self.MAX_IN_MEMORY_EXPERIENCES // 10
+            drop = len(self._experiences) - self.MAX_IN_MEMORY_EXPERIENCES + slack
+            self._experiences = self._experiences[drop:]
+            del self._exp_timestamps[:drop]
+
     def _save_experience(self, experience: Experience):
         """Save an experience to storage."""
-        # Save to daily file for organization
+        # Daily files for organization; the descriptor is kept open and
+        # only reopened when the date rolls over
         date_str = time.strftime("%Y-%m-%d")
-        path = self._storage_dir / f"experiences_{date_str}.jsonl"
-
         try:
-            with open(path, "a") as f:
-                f.write(json.dumps(experience.to_dict()) + "\n")
+            if date_str != self._log_date:
+                self._close_log()
+                path = self._storage_dir / f"experiences_{date_str}.jsonl"
+                self._log_fd = os.open(
+                    str(path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+                )
+                self._log_date = date_str
+            os.write(self._log_fd, _dumps(experience.to_dict()) + b"\n")
         except Exception as e:
             logger.error(f"Failed to save experience: {e}")
 
+    def _close_log(self):
+        """Close the experience log descriptor if open."""
+        if self._log_fd >= 0:
+            try:
+                os.close(self._log_fd)
+            except OSError:
+                pass
+            self._log_fd = -1
+            self._log_date = ""
+
     def _save_patterns(self):
         """Save learned patterns to storage."""
         path = self._storage_dir / "learned_patterns.json"
         try:
-            with open(path, "w") as f:
-                json.dump(self._learned_patterns, f, indent=2)
+            _atomic_write(path, _dumps(self._learned_patterns))
         except Exception as e:
             logger.error(f"Failed to save patterns: {e}")
 
@@ -358,38 +541,48 @@ class LearningModule:
         """Save action statistics to storage."""
         path = self._storage_dir / "action_stats.json"
         try:
-            # Convert stats to serializable format
-            data = {}
-            for ctx, actions in self._action_stats.items():
-                data[ctx] = {
-                    action: {
-                        "action_value": stats.action_value,
-                        "count": stats.count,
-                        "total_reward": stats.total_reward,
-                        "successes": stats.successes,
-                        "failures": stats.failures,
-                    }
-                    for action, stats in actions.items()
+            # Convert stats to the nested on-disk format
+            data: Dict[str, Dict[str, Any]] = {}
+            for (ctx, action), stats in self._action_stats.items():
+                data.setdefault(ctx, {})[action] = {
+                    "action_value": stats.action_value,
+                    "count": stats.count,
+                    "total_reward": stats.total_reward,
+                    "successes": stats.successes,
+                    "failures": stats.failures,
                 }
-            with open(path, "w") as f:
-                json.dump(data, f, indent=2)
+            _atomic_write(path, _dumps(data))
         except Exception as e:
             logger.error(f"Failed to save stats: {e}")
 
     def _load_data(self):
         """Load data from storage."""
-        # Load experiences from recent files
-        for path in sorted(self._storage_dir.glob("experiences_*.jsonl"))[-7:]:
+        # Load experiences from the 7 most recent files. scandir gives us
+        # mtimes in one pass and nlargest avoids sorting the full listing.
+        try:
+            with os.scandir(self._storage_dir) as it:
+                entries = [
+                    (e.stat().st_mtime, e.path) for e in it
+                    if e.name.startswith("experiences_") and e.name.endswith(".jsonl")
+                ]
+        except OSError as e:
+            logger.warning(f"Failed to scan {self._storage_dir}: {e}")
+            entries = []
+
+        for _, path in sorted(heapq.nlargest(7, entries)):
             try:
-                with open(path) as f:
-                    for line in f:
-                        if line.strip():
-                            data = json.loads(line)
-                            exp = Experience.from_dict(data)
-                            self._experiences.append(exp)
-                            self._update_stats(exp)
+                # One read syscall per file, then per-line decode
+                with open(path, "rb") as f:
+                    lines = f.read().splitlines()
+                for line in lines:
+                    if line:
+                        exp = Experience.from_dict(_loads(line))
+                        self._experiences.append(exp)
+                        self._exp_timestamps.append(exp.timestamp)
+                        self._update_stats(exp)
             except Exception as e:
                 logger.warning(f"Failed to load experiences from {path}: {e}")
+        self._trim_to_capacity()
 
         # Load learned patterns
         patterns_path = self._storage_dir / "learned_patterns.json"
@@ -415,15 +608,24 @@ class LearningModule:
                             successes=stats_data["successes"],
                             failures=stats_data["failures"],
                         )
-                        self._action_stats[ctx][action] = stats
+                        if stats.count:
+                            stats.mean_reward = stats.total_reward / stats.count
+                        if (ctx, action) not in self._action_stats:
+                            self._ctx_actions[ctx].append(action)
+                        self._action_stats[(ctx, action)] = stats
+                # Rebuild per-context totals from the loaded stats
+                self._ctx_totals.clear()
+                for (ctx, _), stats in self._action_stats.items():
+                    self._ctx_totals[ctx] += stats.count
             except Exception as e:
                 logger.warning(f"Failed to load stats: {e}")
 
     def get_status(self) -> Dict[str, Any]:
         """Get status for web API."""
+        self._ensure_loaded()
         return {
             "total_experiences": len(self._experiences),
-            "contexts_learned": len(self._action_stats),
+            "contexts_learned": len(self._ctx_actions),
             "pending_batch_size": len(self._pending_batch),
             "learned_patterns": len(self._learned_patterns),
             "top_contexts": self._get_top_contexts(5),
@@ -431,35 +633,59 @@ class LearningModule:
 
     def _get_top_contexts(self, n: int) -> List[Dict[str, Any]]:
         """Get top N contexts by experience count."""
-        ctx_counts = [
-            (ctx, sum(s.count for s in stats.values()))
-            for ctx, stats in self._action_stats.items()
-        ]
-        ctx_counts.sort(key=lambda x: x[1], reverse=True)
+        ctx_counts = sorted(
+            self._ctx_totals.items(), key=lambda x: x[1], reverse=True
+        )
 
-        return [
-            {
+        top = []
+        for ctx, count in ctx_counts[:n]:
+            recommendations = self.get_recommendations(ctx)
+            top.append({
                 "context_hash": ctx,
                 "experience_count": count,
-                "best_action": self.get_recommendations(ctx)[0][0] if self.get_recommendations(ctx) else None,
-            }
-            for ctx, count in ctx_counts[:n]
-        ]
+                "best_action": recommendations[0][0] if recommendations else None,
+            })
+        return top
 
     def clear_old_data(self, days_to_keep: int = 30):
         """Clear experiences older than N days."""
+        self._ensure_loaded()
         cutoff = time.time() - (days_to_keep * 86400)
 
-        # Filter experiences
-        self._experiences = [
-            exp for exp in self._experiences
-            if exp.timestamp > cutoff
-        ]
-
-        # Rebuild stats from remaining experiences
-        self._action_stats.clear()
-        for exp in self._experiences:
-            self._update_stats(exp)
+        # Timestamps are in arrival order, so the expiry point is a bisect
+        # on the parallel array followed by one slice
+        split = bisect.bisect_right(self._exp_timestamps, cutoff)
+        expired = self._experiences[:split]
+        self._experiences = self._experiences[split:]
+        del self._exp_timestamps[:split]
+
+        # Subtract the expired experiences from the stats instead of
+        # replaying every survivor - O(expired), and contexts without
+        # expired experiences are never touched
+        for exp in expired:
+            key = (exp.context_hash, exp.action_value)
+            stats = self._action_stats.get(key)
+            if stats:
+                stats.count -= 1
+                stats.total_reward -= exp.reward
+                if stats.count > 0:
+                    stats.mean_reward = stats.total_reward / stats.count
+                if exp.outcome == "success":
+                    stats.successes -= 1
+                elif exp.outcome == "failed":
+                    stats.failures -= 1
+                if stats.count <= 0:
+                    del self._action_stats[key]
+                    actions = self._ctx_actions.get(exp.context_hash)
+                    if actions:
+                        actions.remove(exp.action_value)
+                        if not actions:
+                            del self._ctx_actions[exp.context_hash]
+
+            if self._ctx_totals[exp.context_hash] <= 1:
+                self._ctx_totals.pop(exp.context_hash, None)
+            else:
+                self._ctx_totals[exp.context_hash] -= 1
 
         # Save updated stats
         self._save_stats()
@@ -467,5 +693,10 @@ class LearningModule:
         logger.info(f"Cleared old data, {len(self._experiences)} experiences remaining")
 
 
-# Global instance
-learning_module = LearningModule()
+# Global instance, created on first attribute access so merely importing
+# the module stays cheap
+def __getattr__(name):
+    if name == "learning_module":
+        instance = globals()["learning_module"] = LearningModule()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,6 +4,7 @@ Orchestrator module - coordinates all agent modules.
 Main entry point: process_observation()
 Coordinates state, goal, plan, decision, and learning modules.
 """
+import asyncio
 import logging
 from typing import Optional, Dict, Any, Tuple
 
@@ -13,11 +14,18 @@ from .state_module import (
 )
 from .goal_module import GoalModule, goal_module, Goal, GoalStatus
 from .plan_module import PlanModule, plan_module, Plan
-from .decision_module import DecisionModule, decision_module, Decision, DecisionTier
+from .decision_module import DecisionModule, decision_module, Decision, DecisionTier, TIER_NAME
 from .learning_module import LearningModule, learning_module
 
 logger = logging.getLogger(__name__)
 
+# Outcome strings as reported by session_monitor, mapped once at import
+_OUTCOME_MAP = {
+    "success": ActionOutcome.SUCCESS,
+    "failed": ActionOutcome.FAILED,
+    "timeout": ActionOutcome.TIMEOUT,
+}
+
 
 class Orchestrator:
     """
@@ -42,6 +50,10 @@ class Orchestrator:
         self.decisions = decision_mod or decision_module
         self.learning = learning_mod or learning_module
 
+        # Per-session status cache keyed on the identity of the component
+        # dicts, which the modules memoize and only replace on mutation
+        self._session_status_cache: Dict[str, tuple] = {}
+
         # Update decision module with UCB recommendations
         self._sync_ucb_recommendations()
 
@@ -79,17 +91,18 @@ class Orchestrator:
         # Get session state
         session_state = self.state.get_state(session_id)
 
+        # If no prompt detected, just observe - this is the common case,
+        # so bail out before the goal/plan lookups
+        if not prompt_type:
+            session_state.set_phase(AgentPhase.OBSERVING)
+            return None
+
         # Get current goal and plan
         active_goal = self.goals.get_active_goal(session_id)
         active_plan = None
         if active_goal:
             active_plan = self.plans.get_active_plan(active_goal.goal_id)
 
-        # If no prompt detected, just observe
-        if not prompt_type:
-            session_state.set_phase(AgentPhase.OBSERVING)
-            return None
-
         # Make decision
         decision = await self.decisions.decide_async(
             prompt_type=prompt_type,
@@ -109,18 +122,23 @@ class Orchestrator:
             await self._handle_replan(session_id, active_goal, decision)
             return None
 
-        # Record the action
+        # Record the action, carrying the context hash so outcome
+        # recording doesn't re-hash the prompt
+        context_hash = decision.context_hash or self.decisions._hash_context(
+            prompt_type, prompt_text or ""
+        )
         obs_index = session_state.total_observations - 1
         action = self.state.record_action(
             session_id=session_id,
             action_type=decision.action_type,
             action_value=decision.action_value,
             observation_index=obs_index,
+            context_hash=context_hash,
         )
 
         # Log the decision
         logger.info(
-            f"Session {session_id[:8]}: {decision.tier.value} decision "
+            f"Session {session_id[:8]}: {TIER_NAME[decision.tier]} decision "
             f"'{decision.action_value}' for {prompt_type} ({decision.confidence:.0%})"
         )
 
@@ -147,11 +165,7 @@ class Orchestrator:
         observation = session_state.latest_observation
 
         # Map outcome string to enum
-        outcome_enum = {
-            "success": ActionOutcome.SUCCESS,
-            "failed": ActionOutcome.FAILED,
-            "timeout": ActionOutcome.TIMEOUT,
-        }.get(outcome, ActionOutcome.FAILED)
+        outcome_enum = _OUTCOME_MAP.get(outcome, ActionOutcome.FAILED)
 
         # Record in state module
         self.state.record_outcome(session_id, outcome_enum, details)
@@ -171,32 +185,54 @@ class Orchestrator:
                     if goal.estimated_steps > 0:
                         progress_before = max(0, (goal.completed_steps - 1) / goal.estimated_steps)
 
-            self.learning.record_experience(
-                session_id=session_id,
-                context_hash=getattr(action, 'context_hash', self.decisions._hash_context(
+            context_hash = action.context_hash
+            if context_hash is None:
+                context_hash = self.decisions._hash_context(
                     observation.prompt_type or "", observation.prompt_text or ""
-                )),
+                )
+
+            # Defer the learning fan-out (experience log append, UCB push,
+            # step counter) to the next loop iteration so the monitor gets
+            # control back as soon as the session state is updated
+            def _learning_tail(
                 prompt_type=observation.prompt_type or "",
                 prompt_text=observation.prompt_text or "",
                 action_type=action.action_type,
                 action_value=action.action_value,
-                outcome=outcome,
-                outcome_details=details,
-                goal_id=goal_id,
-                goal_progress_before=progress_before,
-                goal_progress_after=progress_after,
-            )
-
-            # Update decision module with new recommendations
-            self._sync_ucb_recommendations()
-
-            # Update plan progress if we have an active plan
-            if goal_id:
-                active_plan = self.plans.get_active_plan(goal_id)
-                if active_plan and outcome == "success":
-                    current_step = active_plan.get_current_step()
-                    if current_step:
-                        current_step.actions_taken += 1
+            ):
+                self.learning.record_experience(
+                    session_id=session_id,
+                    context_hash=context_hash,
+                    prompt_type=prompt_type,
+                    prompt_text=prompt_text,
+                    action_type=action_type,
+                    action_value=action_value,
+                    outcome=outcome,
+                    outcome_details=details,
+                    goal_id=goal_id,
+                    goal_progress_before=progress_before,
+                    goal_progress_after=progress_after,
+                )
+
+                # Only the context just observed can have changed scores,
+                # so push that one instead of rebuilding every context
+                self.decisions.update_ucb_recommendations(
+                    context_hash, self.learning.get_recommendations(context_hash)
+                )
+
+                # Update plan progress if we have an active plan
+                if goal_id:
+                    active_plan = self.plans.get_active_plan(goal_id)
+                    if active_plan and outcome == "success":
+                        current_step = active_plan.get_current_step()
+                        if current_step:
+                            current_step.actions_taken += 1
+
+            try:
+                asyncio.get_running_loop().call_soon(_learning_tail)
+            except RuntimeError:
+                # No running loop (sync callers in tests/tools) - run inline
+                _learning_tail()
 
     def set_goal(
         self,
@@ -342,6 +378,7 @@ class Orchestrator:
         """Clean up when a session is closed."""
         # Don't remove goals/plans - they persist
         self.state.remove_session(session_id)
+        self._session_status_cache.pop(session_id, None)
         logger.info(f"Cleaned up session {session_id[:8]}")
 
     def get_session_status(self, session_id: str) -> Dict[str, Any]:
@@ -352,11 +389,25 @@ class Orchestrator:
         if goal:
             plan = self.plans.get_active_plan(goal.goal_id)
 
-        return {
-            "state": session_state.to_dict(),
-            "goal": goal.to_dict() if goal else None,
-            "plan": plan.to_dict() if plan else None,
+        # The component to_dicts are memoized and refresh their own
+        # wall-clock fields in place, so if all three objects are the ones
+        # already assembled, the composed dict is still current
+        state_dict = session_state.to_dict()
+        goal_dict = goal.to_dict() if goal else None
+        plan_dict = plan.to_dict() if plan else None
+
+        key = (id(state_dict), id(goal_dict), id(plan_dict))
+        cached = self._session_status_cache.get(session_id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        status = {
+            "state": state_dict,
+            "goal": goal_dict,
+            "plan": plan_dict,
         }
+        self._session_status_cache[session_id] = (key, status)
+        return status
 
     def get_full_status(self) -> Dict[str, Any]:
         """Get full agent system status."""
@@ -8,14 +8,42 @@ Features:
 - Persistent storage
 """
 import json
+import os
+import threading
 import time
 import uuid
+import weakref
 import logging
 from enum import Enum
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Any
 
+# Plans are rewritten on every flush; prefer the C encoder when present.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Write via temp file + rename so readers never see a torn file."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,7 +56,7 @@ class StepStatus(Enum):
     SKIPPED = "skipped"          # Skipped (e.g., already done or not needed)
 
 
-@dataclass
+@dataclass(slots=True)
 class PlanStep:
     """A single step in a plan."""
     step_id: str
@@ -48,15 +76,23 @@ class PlanStep:
     actions_taken: int = 0       # Number of agent actions for this step
     retries: int = 0             # Number of retry attempts
 
+    # Monotonic twins of started_at/completed_at, used for duration math
+    # so NTP adjustments can't skew it. Not persisted - steps loaded from
+    # disk fall back to the wall-clock timestamps.
+    _started_mono: Optional[float] = field(default=None, init=False, repr=False)
+    _completed_mono: Optional[float] = field(default=None, init=False, repr=False)
+
     def start(self):
         """Mark step as started."""
         self.status = StepStatus.IN_PROGRESS
         self.started_at = time.time()
+        self._started_mono = time.monotonic()
 
     def complete(self, notes: Optional[str] = None):
         """Mark step as completed."""
         self.status = StepStatus.COMPLETED
         self.completed_at = time.time()
+        self._completed_mono = time.monotonic()
         if notes:
             self.outcome_notes = notes
 
@@ -64,12 +100,14 @@ class PlanStep:
         """Mark step as failed."""
         self.status = StepStatus.FAILED
         self.completed_at = time.time()
+        self._completed_mono = time.monotonic()
         self.error_message = error
 
     def skip(self, reason: str):
         """Skip this step."""
         self.status = StepStatus.SKIPPED
         self.completed_at = time.time()
+        self._completed_mono = time.monotonic()
         self.outcome_notes = reason
 
     def retry(self):
@@ -86,6 +124,12 @@ class PlanStep:
     @property
     def duration_seconds(self) -> float:
         """Get duration in seconds."""
+        if self._started_mono is not None:
+            end = self._completed_mono
+            if end is None:
+                end = time.monotonic()
+            return end - self._started_mono
+        # Loaded from disk - only wall-clock timestamps survive
         if not self.started_at:
             return 0
         end = self.completed_at or time.time()
@@ -124,7 +168,7 @@ class PlanStep:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Plan:
     """A plan to achieve a goal."""
     plan_id: str
@@ -145,14 +189,31 @@ class Plan:
     # Current execution state
     current_step_index: int = 0
 
+    # Incremental step counters maintained by the transition methods so
+    # status properties don't rescan every step
+    _completed_count: int = field(default=0, init=False, repr=False)
+    _failed_count: int = field(default=0, init=False, repr=False)
+
+    # Memoized to_dict result, invalidated by mutators; the running
+    # step's duration is refreshed on every call
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _dict_dirty: bool = field(default=True, init=False, repr=False)
+
+    # Hash of the last payload written to disk, used to skip rewrites
+    # that would produce identical bytes
+    _last_saved_hash: Optional[int] = field(default=None, init=False, repr=False)
+
     def add_step(self, description: str) -> PlanStep:
         """Add a step to the plan."""
+        # Step ids only need to be unique within their plan, so derive
+        # them from the plan id instead of drawing urandom per step
         step = PlanStep(
-            step_id=str(uuid.uuid4()),
+            step_id=f"{self.plan_id}:{len(self.steps)}",
             description=description,
             order=len(self.steps),
         )
         self.steps.append(step)
+        self._dict_dirty = True
         return step
 
     def add_steps(self, descriptions: List[str]):
@@ -163,6 +224,7 @@ class Plan:
     def start(self):
         """Start executing the plan."""
         self.started_at = time.time()
+        self._dict_dirty = True
         if self.steps:
             self.steps[0].start()
         logger.info(f"Plan {self.plan_id[:8]} started with {len(self.steps)} steps")
@@ -179,9 +241,11 @@ class Plan:
         current = self.get_current_step()
         if current and current.status == StepStatus.IN_PROGRESS:
             current.complete()
+            self._completed_count += 1
 
         # Move to next step
         self.current_step_index += 1
+        self._dict_dirty = True
 
         next_step = self.get_current_step()
         if next_step:
@@ -197,13 +261,19 @@ class Plan:
         """Mark current step as failed."""
         current = self.get_current_step()
         if current:
+            if current.status != StepStatus.FAILED:
+                self._failed_count += 1
             current.fail(error)
+            self._dict_dirty = True
 
     def retry_current_step(self) -> bool:
         """Retry the current step. Returns False if max retries exceeded."""
         current = self.get_current_step()
         if current and current.retries < 3:  # Max 3 retries
+            if current.status == StepStatus.FAILED:
+                self._failed_count -= 1
             current.retry()
+            self._dict_dirty = True
             return True
         return False
 
@@ -219,6 +289,7 @@ class Plan:
         self.is_active = False
         self.replan_reasons.append(reason)
         self.completed_at = time.time()
+        self._dict_dirty = True
         logger.info(f"Plan {self.plan_id[:8]} invalidated: {reason}")
 
     @property
@@ -231,22 +302,31 @@ class Plan:
         """Calculate progress percentage."""
         if not self.steps:
             return 0
-        completed = sum(1 for s in self.steps if s.status == StepStatus.COMPLETED)
-        return (completed / len(self.steps)) * 100
+        return (self._completed_count / len(self.steps)) * 100
 
     @property
     def completed_steps(self) -> int:
         """Count completed steps."""
-        return sum(1 for s in self.steps if s.status == StepStatus.COMPLETED)
+        return self._completed_count
 
     @property
     def failed_steps(self) -> int:
         """Count failed steps."""
-        return sum(1 for s in self.steps if s.status == StepStatus.FAILED)
+        return self._failed_count
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return {
+        if self._dict_cache is not None and not self._dict_dirty:
+            # Only the running step's duration moves without a mutation
+            step = self.get_current_step()
+            if step and step.started_at and not step.is_done:
+                self._dict_cache["steps"][self.current_step_index][
+                    "duration_seconds"
+                ] = step.duration_seconds
+            return self._dict_cache
+
+        self._dict_dirty = False
+        self._dict_cache = {
             "plan_id": self.plan_id,
             "goal_id": self.goal_id,
             "session_id": self.session_id,
@@ -262,6 +342,7 @@ class Plan:
             "completed_steps": self.completed_steps,
             "failed_steps": self.failed_steps,
         }
+        return self._dict_cache
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Plan":
@@ -279,9 +360,23 @@ class Plan:
             current_step_index=data.get("current_step_index", 0),
         )
         plan.steps = [PlanStep.from_dict(s) for s in data.get("steps", [])]
+        # Rebuild the incremental counters once at load
+        plan._completed_count = sum(
+            1 for s in plan.steps if s.status == StepStatus.COMPLETED
+        )
+        plan._failed_count = sum(
+            1 for s in plan.steps if s.status == StepStatus.FAILED
+        )
         return plan
 
 
+def _flush_on_shutdown(module_ref):
+    """Flush a still-live PlanModule on interpreter exit."""
+    module = module_ref()
+    if module is not None:
+        module.flush()
+
+
 class PlanModule:
     """
     Manages plans for goals.
@@ -290,11 +385,29 @@ class PlanModule:
     current plan becomes invalid.
     """
 
+    # Minimum seconds between opportunistic flushes of dirty plans
+    FLUSH_INTERVAL = 1.0
+
     def __init__(self, storage_dir: Optional[Path] = None):
         """Initialize with optional custom storage directory."""
         self._plans: Dict[str, Plan] = {}  # plan_id → Plan
         self._goal_plans: Dict[str, List[str]] = {}  # goal_id → [plan_ids]
 
+        # goal_id → plan_id of the active plan; get_active_plan sits on
+        # the per-observation hot path, so keep it a dict lookup
+        self._active_plan_by_goal: Dict[str, str] = {}
+
+        # Plans awaiting persistence - mutations mark plans dirty and the
+        # file write happens at most once per FLUSH_INTERVAL, so a step
+        # advance no longer costs a full rewrite per mutation.
+        self._dirty: set = set()
+        self._last_flush = 0.0
+
+        # Cached get_status payload, rebuilt only after a plan mutates
+        # or the plan population changes
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_dirty = True
+
         # Storage setup
         if storage_dir:
             self._storage_dir = storage_dir
@@ -302,9 +415,29 @@ class PlanModule:
             self._storage_dir = Path.home() / ".claude-continue" / "plans"
 
         self._storage_dir.mkdir(parents=True, exist_ok=True)
-        self._load_plans()
 
-        logger.info(f"PlanModule initialized with {len(self._plans)} plans")
+        # Persisted plans are loaded lazily on first use so importing the
+        # agent package doesn't block on disk I/O
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+        # Make sure pending writes land on process exit. weakref.finalize
+        # (unlike atexit.register(self.flush)) doesn't pin the instance, so
+        # short-lived modules in tests are collected normally
+        weakref.finalize(self, _flush_on_shutdown, weakref.ref(self))
+
+        logger.info(f"PlanModule initialized (storage: {self._storage_dir})")
+
+    def _ensure_loaded(self):
+        """Load persisted plans on first access."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            self._load_plans()
+            self._loaded = True
+            logger.info(f"PlanModule loaded {len(self._plans)} plans")
 
     def create_plan(
         self,
@@ -313,6 +446,7 @@ class PlanModule:
         steps: Optional[List[str]] = None,
     ) -> Plan:
         """Create a new plan for a goal."""
+        self._ensure_loaded()
         plan_id = str(uuid.uuid4())
 
         # Check for existing plans and increment replan count
@@ -323,7 +457,7 @@ class PlanModule:
             for existing in existing_plans:
                 if existing.is_active:
                     existing.invalidate("Replaced by new plan")
-                    self._save_plan(existing)
+                    self._mark_dirty(existing)
             replan_count = max(p.replan_count for p in existing_plans) + 1
 
         plan = Plan(
@@ -343,40 +477,58 @@ class PlanModule:
         if goal_id not in self._goal_plans:
             self._goal_plans[goal_id] = []
         self._goal_plans[goal_id].append(plan_id)
+        self._active_plan_by_goal[goal_id] = plan_id
 
         # Persist
-        self._save_plan(plan)
+        self._mark_dirty(plan)
 
         logger.info(f"Created plan {plan_id[:8]} for goal {goal_id[:8]} with {len(steps or [])} steps")
         return plan
 
     def get_plan(self, plan_id: str) -> Optional[Plan]:
         """Get a plan by ID."""
+        self._ensure_loaded()
         return self._plans.get(plan_id)
 
     def get_goal_plans(self, goal_id: str) -> List[Plan]:
         """Get all plans for a goal."""
+        self._ensure_loaded()
         plan_ids = self._goal_plans.get(goal_id, [])
         return [self._plans[pid] for pid in plan_ids if pid in self._plans]
 
     def get_active_plan(self, goal_id: str) -> Optional[Plan]:
         """Get the active plan for a goal."""
-        plans = self.get_goal_plans(goal_id)
-        active = [p for p in plans if p.is_active]
-        return active[0] if active else None
+        self._ensure_loaded()
+        plan_id = self._active_plan_by_goal.get(goal_id)
+        if plan_id:
+            plan = self._plans.get(plan_id)
+            if plan and plan.is_active:
+                return plan
+            # Stale pointer (e.g. plan invalidated directly) - drop it
+            del self._active_plan_by_goal[goal_id]
+
+        # Fall back to a scan and repopulate the index
+        for plan in self.get_goal_plans(goal_id):
+            if plan.is_active:
+                self._active_plan_by_goal[goal_id] = plan.plan_id
+                return plan
+        return None
 
     def update_plan(self, plan: Plan):
         """Update and persist a plan."""
+        self._ensure_loaded()
         if plan.plan_id in self._plans:
             self._plans[plan.plan_id] = plan
-            self._save_plan(plan)
+            if plan.is_active:
+                self._active_plan_by_goal[plan.goal_id] = plan.plan_id
+            self._mark_dirty(plan)
 
     def advance_plan(self, plan_id: str) -> Optional[PlanStep]:
         """Advance a plan to the next step."""
         plan = self.get_plan(plan_id)
         if plan:
             next_step = plan.advance()
-            self._save_plan(plan)
+            self._mark_dirty(plan)
             return next_step
         return None
 
@@ -386,25 +538,56 @@ class PlanModule:
         current = self.get_active_plan(goal_id)
         if current:
             current.invalidate(reason)
-            self._save_plan(current)
+            self._mark_dirty(current)
 
         # Create new plan
         return self.create_plan(goal_id, session_id, new_steps)
 
+    def _mark_dirty(self, plan: Plan):
+        """Queue a plan for persistence and flush if the interval elapsed."""
+        # Also covers callers that mutate steps directly before update_plan
+        plan._dict_dirty = True
+        self._status_dirty = True
+        self._dirty.add(plan.plan_id)
+        if time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Write all dirty plans to storage."""
+        self._last_flush = time.monotonic()
+        if not self._storage_dir.is_dir():
+            # Storage was removed under us (e.g. test teardown) - there is
+            # nowhere to write, so drop the pending saves quietly
+            self._dirty.clear()
+            return
+        while self._dirty:
+            plan = self._plans.get(self._dirty.pop())
+            if plan:
+                self._save_plan(plan)
+
     def remove_goal_plans(self, goal_id: str):
         """Remove all plans for a goal."""
+        self._ensure_loaded()
+        # Persist any pending state before dropping the plans from memory
+        self.flush()
         plan_ids = self._goal_plans.pop(goal_id, [])
+        self._active_plan_by_goal.pop(goal_id, None)
         for plan_id in plan_ids:
             if plan_id in self._plans:
                 del self._plans[plan_id]
+        self._status_dirty = True
         logger.info(f"Removed {len(plan_ids)} plans for goal {goal_id[:8]}")
 
     def _save_plan(self, plan: Plan):
-        """Save a plan to storage."""
+        """Save a plan to storage, skipping writes with unchanged content."""
+        data = _dumps(plan.to_dict())
+        payload_hash = hash(data)
+        if payload_hash == plan._last_saved_hash:
+            return
         path = self._storage_dir / f"{plan.plan_id}.json"
         try:
-            with open(path, "w") as f:
-                json.dump(plan.to_dict(), f, indent=2)
+            _atomic_write(path, data)
+            plan._last_saved_hash = payload_hash
         except Exception as e:
             logger.error(f"Failed to save plan {plan.plan_id[:8]}: {e}")
 
@@ -412,23 +595,32 @@ class PlanModule:
         """Load active plans from storage."""
         for path in self._storage_dir.glob("*.json"):
             try:
-                with open(path) as f:
-                    data = json.load(f)
-                    plan = Plan.from_dict(data)
+                data = _loads(path.read_bytes())
+                plan = Plan.from_dict(data)
 
-                    # Only load active plans
-                    if plan.is_active:
-                        self._plans[plan.plan_id] = plan
-                        if plan.goal_id not in self._goal_plans:
-                            self._goal_plans[plan.goal_id] = []
-                        self._goal_plans[plan.goal_id].append(plan.plan_id)
+                # Only load active plans
+                if plan.is_active:
+                    self._plans[plan.plan_id] = plan
+                    if plan.goal_id not in self._goal_plans:
+                        self._goal_plans[plan.goal_id] = []
+                    self._goal_plans[plan.goal_id].append(plan.plan_id)
+                    self._active_plan_by_goal.setdefault(plan.goal_id, plan.plan_id)
 
             except Exception as e:
                 logger.warning(f"Failed to load plan from {path}: {e}")
 
     def get_status(self) -> Dict[str, Any]:
         """Get status for web API."""
-        return {
+        self._ensure_loaded()
+        if self._status_cache is not None and not self._status_dirty:
+            # Per-plan dicts are shared with the cache, so refreshing
+            # them updates running-step durations in place
+            for plan in self._plans.values():
+                plan.to_dict()
+            return self._status_cache
+
+        self._status_dirty = False
+        self._status_cache = {
             "total_plans": len(self._plans),
             "active_plans": sum(1 for p in self._plans.values() if p.is_active),
             "plans_by_goal": {
@@ -436,7 +628,13 @@ class PlanModule:
                 for gid, pids in self._goal_plans.items()
             },
         }
+        return self._status_cache
 
 
-# Global instance
-plan_module = PlanModule()
+# Global instance, created on first attribute access so merely importing
+# the module stays cheap
+def __getattr__(name):
+    if name == "plan_module":
+        instance = globals()["plan_module"] = PlanModule()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,15 +7,50 @@ Maintains the current state of each session including:
 - Current phase in the agent lifecycle
 - Progress metrics
 """
+import re
+import threading
 import time
 import logging
 from enum import Enum
 from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Any
-from collections import deque
 
 logger = logging.getLogger(__name__)
 
+# Single compiled alternation scans the screen once, case-insensitively,
+# instead of lowercasing the whole buffer and probing keyword by keyword
+_ERROR_KEYWORDS_RE = re.compile(r"error|failed|exception|traceback", re.IGNORECASE)
+
+# How many observations/actions each session retains
+HISTORY_SIZE = 100
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Max Hamming distance between two screen fingerprints still considered
+# "the same screen" for stuck detection
+_SIMHASH_THRESHOLD = 6
+
+
+def _simhash64(text: str) -> int:
+    """Compute a 64-bit SimHash fingerprint of the given text.
+
+    Near-identical text yields fingerprints within a few bits of each
+    other, so a spinner frame or timestamp no longer defeats the stuck
+    detector the way exact line comparison did. hash() is salted per
+    process, which is fine - fingerprints are only ever compared against
+    each other in memory.
+    """
+    votes = [0] * 64
+    for token in _TOKEN_RE.findall(text):
+        h = hash(token) & 0xFFFFFFFFFFFFFFFF
+        for i in range(64):
+            votes[i] += 1 if (h >> i) & 1 else -1
+    out = 0
+    for i in range(64):
+        if votes[i] > 0:
+            out |= 1 << i
+    return out
+
 
 class AgentPhase(Enum):
     """Agent lifecycle phases."""
@@ -28,7 +63,7 @@ class AgentPhase(Enum):
     STUCK = "stuck"                  # Unable to progress, needs help
 
 
-@dataclass
+@dataclass(slots=True)
 class Observation:
     """A single observation of the screen state."""
     timestamp: float
@@ -43,12 +78,29 @@ class Observation:
     has_question: bool = False
     line_count: int = 0
 
+    # Fingerprint of the screen tail, computed once so similarity checks
+    # are a single XOR + popcount
+    _simhash: int = field(init=False, default=0)
+
+    # Hash of the full screen, used to dedupe byte-identical repeats
+    _content_hash: int = field(init=False, default=0)
+
     def __post_init__(self):
         """Compute derived features."""
         if self.screen_content:
-            self.line_count = len(self.screen_content.split('\n'))
-            self.has_error = any(kw in self.screen_content.lower()
-                                for kw in ['error', 'failed', 'exception', 'traceback'])
+            # Hash the buffer as delivered - record_observation dedupes
+            # against the raw incoming string - then normalize once so no
+            # later consumer has to strip trailing blank padding itself
+            self._content_hash = hash(self.screen_content)
+            self.screen_content = self.screen_content.rstrip()
+            self.line_count = self.screen_content.count('\n') + 1
+            self.has_error = _ERROR_KEYWORDS_RE.search(self.screen_content) is not None
+            # Fingerprint only the tail - that's where the live output is
+            self._simhash = _simhash64(self.screen_content[-2048:])
+            # Nothing reads the full buffer after feature extraction, so
+            # retain only the tail instead of 100 whole scrollbacks
+            if len(self.screen_content) > 4096:
+                self.screen_content = self.screen_content[-4096:]
         if self.prompt_type:
             self.has_permission = self.prompt_type == "permission"
             self.has_question = self.prompt_type == "question"
@@ -63,7 +115,7 @@ class ActionOutcome(Enum):
     SKIPPED = "skipped"              # Action was skipped
 
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """An action taken by the agent."""
     timestamp: float
@@ -77,23 +129,37 @@ class Action:
     outcome_timestamp: Optional[float] = None
     outcome_details: Optional[str] = None
 
-    def mark_outcome(self, outcome: ActionOutcome, details: Optional[str] = None):
+    # Context hash of the triggering observation, carried along so
+    # outcome recording doesn't have to re-hash the prompt
+    context_hash: Optional[str] = None
+
+    def mark_outcome(
+        self,
+        outcome: ActionOutcome,
+        details: Optional[str] = None,
+        now: Optional[float] = None,
+    ):
         """Record the outcome of this action."""
         self.outcome = outcome
-        self.outcome_timestamp = time.time()
+        self.outcome_timestamp = now if now is not None else time.time()
         self.outcome_details = details
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionState:
     """Complete state for a single session."""
     session_id: str
     phase: AgentPhase = AgentPhase.IDLE
     phase_changed_at: float = field(default_factory=time.time)
 
-    # History (limited size for memory efficiency)
-    observations: deque = field(default_factory=lambda: deque(maxlen=100))
-    actions: deque = field(default_factory=lambda: deque(maxlen=100))
+    # History kept in preallocated ring buffers indexed by the running
+    # totals, so appends never shift or reallocate
+    _obs_buf: List[Optional[Observation]] = field(
+        default_factory=lambda: [None] * HISTORY_SIZE, repr=False
+    )
+    _act_buf: List[Optional[Action]] = field(
+        default_factory=lambda: [None] * HISTORY_SIZE, repr=False
+    )
 
     # Progress metrics
     total_observations: int = 0
@@ -101,47 +167,93 @@ class SessionState:
     successful_actions: int = 0
     failed_actions: int = 0
 
-    # Stuck detection
+    # Stuck detection. last_progress_at is wall clock for display;
+    # the monotonic twin drives the stall timeout so clock jumps can't
+    # fake or mask progress
     similar_observations_count: int = 0
     last_progress_at: float = field(default_factory=time.time)
+    _last_progress_mono: float = field(default_factory=time.monotonic, repr=False)
 
     # Goal reference (set by GoalModule)
     current_goal_id: Optional[str] = None
 
+    # Bumped on every mutation; lets to_dict and status callers detect
+    # that nothing changed between polls
+    version: int = 0
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _dict_version: int = field(default=-1, init=False, repr=False)
+
+    # Success rate recomputed only when an outcome lands; to_dict reads
+    # the cached value
+    _success_rate: float = field(default=1.0, init=False, repr=False)
+
+    # Serializes mutations of this one session; sessions never contend
+    # with each other
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def readd_latest_observation(self, now: float) -> Observation:
+        """Re-reference the latest observation for an identical screen.
+
+        The ring slot for the new index points at the same object, so
+        index arithmetic stays valid without re-extracting features.
+        """
+        with self._lock:
+            obs = self._obs_buf[(self.total_observations - 1) % HISTORY_SIZE]
+            obs.timestamp = now
+            self._obs_buf[self.total_observations % HISTORY_SIZE] = obs
+            self.total_observations += 1
+            self.similar_observations_count += 1
+            self.version += 1
+            return obs
+
     def add_observation(self, obs: Observation) -> int:
         """Add an observation and return its index."""
-        self.observations.append(obs)
-        self.total_observations += 1
-        return self.total_observations - 1
+        with self._lock:
+            self._obs_buf[self.total_observations % HISTORY_SIZE] = obs
+            self.total_observations += 1
+            self.version += 1
+            return self.total_observations - 1
 
     def add_action(self, action: Action):
         """Add an action to history."""
-        self.actions.append(action)
-        self.total_actions += 1
+        with self._lock:
+            self._act_buf[self.total_actions % HISTORY_SIZE] = action
+            self.total_actions += 1
+            self.version += 1
 
-    def record_action_outcome(self, outcome: ActionOutcome):
+    def record_action_outcome(self, outcome: ActionOutcome, now: Optional[float] = None):
         """Update metrics based on action outcome."""
-        if outcome == ActionOutcome.SUCCESS:
-            self.successful_actions += 1
-            self.last_progress_at = time.time()
-            self.similar_observations_count = 0
-        elif outcome == ActionOutcome.FAILED:
-            self.failed_actions += 1
-
-    def set_phase(self, phase: AgentPhase):
+        with self._lock:
+            if outcome == ActionOutcome.SUCCESS:
+                self.successful_actions += 1
+                self.last_progress_at = now if now is not None else time.time()
+                self._last_progress_mono = time.monotonic()
+                self.similar_observations_count = 0
+            elif outcome == ActionOutcome.FAILED:
+                self.failed_actions += 1
+            total = self.successful_actions + self.failed_actions
+            if total:
+                self._success_rate = self.successful_actions / total
+            self.version += 1
+
+    def set_phase(self, phase: AgentPhase, now: Optional[float] = None):
         """Transition to a new phase."""
-        if phase != self.phase:
-            logger.debug(f"Session {self.session_id[:8]}: {self.phase.value} → {phase.value}")
+        if phase == self.phase:
+            return
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Session %s: %s -> %s",
+                         self.session_id[:8], self.phase.value, phase.value)
+        with self._lock:
             self.phase = phase
-            self.phase_changed_at = time.time()
+            self.phase_changed_at = now if now is not None else time.time()
+            self.version += 1
 
     @property
     def success_rate(self) -> float:
-        """Calculate success rate of actions."""
-        total = self.successful_actions + self.failed_actions
-        if total == 0:
-            return 1.0  # No actions yet = perfect
-        return self.successful_actions / total
+        """Success rate of actions (1.0 until any outcome is recorded)."""
+        return self._success_rate
 
     @property
     def is_stuck(self) -> bool:
@@ -150,23 +262,38 @@ class SessionState:
         if self.similar_observations_count >= 3:
             return True
         # Stuck if no progress for 5+ minutes
-        if time.time() - self.last_progress_at > 300:
+        if time.monotonic() - self._last_progress_mono > 300:
             return True
         return False
 
     @property
     def latest_observation(self) -> Optional[Observation]:
         """Get the most recent observation."""
-        return self.observations[-1] if self.observations else None
+        if not self.total_observations:
+            return None
+        return self._obs_buf[(self.total_observations - 1) % HISTORY_SIZE]
 
     @property
     def latest_action(self) -> Optional[Action]:
         """Get the most recent action."""
-        return self.actions[-1] if self.actions else None
+        if not self.total_actions:
+            return None
+        return self._act_buf[(self.total_actions - 1) % HISTORY_SIZE]
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for web API."""
-        return {
+        with self._lock:
+            return self._to_dict_locked()
+
+    def _to_dict_locked(self) -> Dict[str, Any]:
+        if self._dict_cache is not None and self._dict_version == self.version:
+            # Only the wall-clock-derived fields move without a mutation
+            self._dict_cache["is_stuck"] = self.is_stuck
+            self._dict_cache["seconds_since_progress"] = time.time() - self.last_progress_at
+            return self._dict_cache
+
+        self._dict_version = self.version
+        self._dict_cache = {
             "session_id": self.session_id,
             "phase": self.phase.value,
             "phase_changed_at": self.phase_changed_at,
@@ -179,6 +306,7 @@ class SessionState:
             "current_goal_id": self.current_goal_id,
             "seconds_since_progress": time.time() - self.last_progress_at,
         }
+        return self._dict_cache
 
 
 class StateModule:
@@ -191,14 +319,22 @@ class StateModule:
 
     def __init__(self):
         self._sessions: Dict[str, SessionState] = {}
+        # Guards the session map itself; each SessionState carries its
+        # own lock for mutations
+        self._sessions_lock = threading.Lock()
         logger.info("StateModule initialized")
 
     def get_state(self, session_id: str) -> SessionState:
         """Get or create state for a session."""
-        if session_id not in self._sessions:
-            self._sessions[session_id] = SessionState(session_id=session_id)
-            logger.info(f"Created state for session {session_id[:8]}")
-        return self._sessions[session_id]
+        state = self._sessions.get(session_id)
+        if state is None:
+            with self._sessions_lock:
+                state = self._sessions.get(session_id)
+                if state is None:
+                    state = SessionState(session_id=session_id)
+                    self._sessions[session_id] = state
+                    logger.info(f"Created state for session {session_id[:8]}")
+        return state
 
     def record_observation(
         self,
@@ -209,9 +345,25 @@ class StateModule:
     ) -> Observation:
         """Record an observation for a session."""
         state = self.get_state(session_id)
+        now = time.time()
+
+        # Idle screens arrive unchanged many times a minute; when the
+        # buffer is byte-identical to the previous observation, reuse it
+        # instead of re-running feature extraction
+        latest = state.latest_observation
+        if (
+            latest is not None
+            and latest.prompt_type == prompt_type
+            and latest.prompt_text == prompt_text
+            and latest._content_hash == hash(screen_content)
+        ):
+            obs = state.readd_latest_observation(now)
+            if prompt_type:
+                state.set_phase(AgentPhase.OBSERVING, now=now)
+            return obs
 
         obs = Observation(
-            timestamp=time.time(),
+            timestamp=now,
             screen_content=screen_content,
             prompt_type=prompt_type,
             prompt_text=prompt_text,
@@ -229,7 +381,7 @@ class StateModule:
 
         # Update phase based on observation
         if prompt_type:
-            state.set_phase(AgentPhase.OBSERVING)
+            state.set_phase(AgentPhase.OBSERVING, now=now)
 
         return obs
 
@@ -239,20 +391,23 @@ class StateModule:
         action_type: str,
         action_value: str,
         observation_index: int,
+        context_hash: Optional[str] = None,
     ) -> Action:
         """Record an action taken for a session."""
         state = self.get_state(session_id)
+        now = time.time()
 
         action = Action(
-            timestamp=time.time(),
+            timestamp=now,
             action_type=action_type,
             action_value=action_value,
             observation_id=observation_index,
             session_id=session_id,
+            context_hash=context_hash,
         )
 
         state.add_action(action)
-        state.set_phase(AgentPhase.WAITING)
+        state.set_phase(AgentPhase.WAITING, now=now)
 
         return action
 
@@ -264,10 +419,11 @@ class StateModule:
     ):
         """Record the outcome of the most recent action."""
         state = self.get_state(session_id)
+        now = time.time()
 
         if state.latest_action:
-            state.latest_action.mark_outcome(outcome, details)
-            state.record_action_outcome(outcome)
+            state.latest_action.mark_outcome(outcome, details, now=now)
+            state.record_action_outcome(outcome, now=now)
 
             if outcome == ActionOutcome.SUCCESS:
                 state.set_phase(AgentPhase.OBSERVING)
@@ -281,13 +437,27 @@ class StateModule:
 
     def remove_session(self, session_id: str):
         """Remove state for a closed session."""
-        if session_id in self._sessions:
-            del self._sessions[session_id]
-            logger.info(f"Removed state for session {session_id[:8]}")
+        with self._sessions_lock:
+            if session_id in self._sessions:
+                del self._sessions[session_id]
+                logger.info(f"Removed state for session {session_id[:8]}")
 
     def get_all_states(self) -> Dict[str, SessionState]:
-        """Get all session states."""
-        return self._sessions.copy()
+        """Get all session states as a dict (materializes a copy)."""
+        return dict(self.iter_states())
+
+    def iter_states(self):
+        """Yield (session_id, state) pairs without copying the map.
+
+        Snapshots only the key list under the lock, then resolves each
+        key lazily; sessions removed mid-iteration are skipped.
+        """
+        with self._sessions_lock:
+            keys = list(self._sessions)
+        for key in keys:
+            state = self._sessions.get(key)
+            if state is not None:
+                yield key, state
 
     def _is_similar(self, obs1: Observation, obs2: Observation) -> bool:
         """Check if two observations are similar (for stuck detection)."""
@@ -299,11 +469,9 @@ class StateModule:
         if abs(obs1.line_count - obs2.line_count) > 5:
             return False
 
-        # Compare last few lines (most relevant part)
-        lines1 = obs1.screen_content.strip().split('\n')[-5:]
-        lines2 = obs2.screen_content.strip().split('\n')[-5:]
-
-        return lines1 == lines2
+        # Near-duplicate check on the cached fingerprints: tolerant of
+        # spinner/timestamp churn that exact line equality tripped over
+        return (obs1._simhash ^ obs2._simhash).bit_count() <= _SIMHASH_THRESHOLD
 
     def get_status(self) -> Dict[str, Any]:
         """Get status for web API."""
@@ -311,7 +479,7 @@ class StateModule:
             "active_sessions": len(self._sessions),
             "sessions": {
                 sid: state.to_dict()
-                for sid, state in self._sessions.items()
+                for sid, state in self.iter_states()
             },
         }
 
@@ -26,14 +26,18 @@ Requirements:
 """
 
 import asyncio
+import atexit
+import errno
 import logging
 import argparse
+import queue
 import sys
 import os
 import signal
 import socket
-import subprocess
-import webbrowser
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -46,31 +50,28 @@ from config import (
 )
 
 
-def open_browser_tab(url: str) -> bool:
-    """Open URL in browser.
-
-    Note: Reusing existing tabs requires AppleScript permissions.
-    If you want tab reuse, grant Automation permissions in:
-    System Preferences > Privacy & Security > Automation
+def _browser_tab_script(url: str) -> str:
+    """AppleScript that focuses an existing Chrome tab for url or opens one.
 
-    Returns True if successful.
+    Fetches every tab URL in one Apple Event instead of one round trip
+    per tab - the per-tab "URL of t" reads dominated latency before.
     """
-    # Try AppleScript first (requires Automation permissions for Chrome)
-    applescript = f'''
+    return f'''
     tell application "Google Chrome"
-        set found to false
-        repeat with w in windows
-            set tabIndex to 0
-            repeat with t in tabs of w
-                set tabIndex to tabIndex + 1
-                if URL of t starts with "{url}" then
-                    set active tab index of w to tabIndex
-                    set index of w to 1
-                    activate
-                    return "found"
-                end if
+        if (count of windows) > 0 then
+            set allUrls to URL of tabs of every window
+            repeat with wi from 1 to count of allUrls
+                set windowUrls to item wi of allUrls
+                repeat with ti from 1 to count of windowUrls
+                    if item ti of windowUrls starts with "{url}" then
+                        set active tab index of window wi to ti
+                        set index of window wi to 1
+                        activate
+                        return "found"
+                    end if
+                end repeat
             end repeat
-        end repeat
+        end if
         -- Not found, open new tab
         if (count of windows) = 0 then
             make new window
@@ -82,9 +83,34 @@ def open_browser_tab(url: str) -> bool:
     end tell
     '''
 
+
+def _open_browser_fallback(url: str) -> bool:
+    """Open url in the default browser (always a new tab)."""
+    import webbrowser
+
+    try:
+        webbrowser.open(url)
+        return True
+    except Exception:
+        return False
+
+
+def open_browser_tab(url: str) -> bool:
+    """Open URL in browser.
+
+    Note: Reusing existing tabs requires AppleScript permissions.
+    If you want tab reuse, grant Automation permissions in:
+    System Preferences > Privacy & Security > Automation
+
+    Returns True if successful.
+    """
+    # Imported here so --version/--setup invocations never pay for it
+    import subprocess
+
+    # Try AppleScript first (requires Automation permissions for Chrome)
     try:
         result = subprocess.run(
-            ['osascript', '-e', applescript],
+            ['osascript', '-e', _browser_tab_script(url)],
             capture_output=True,
             text=True,
             timeout=5
@@ -94,12 +120,93 @@ def open_browser_tab(url: str) -> bool:
     except Exception:
         pass
 
-    # Fallback to default browser (will open new tab)
+    return _open_browser_fallback(url)
+
+
+async def open_browser_tab_async(url: str) -> bool:
+    """Async variant of open_browser_tab for use inside the daemon loop.
+
+    Runs osascript as an asyncio subprocess so session events keep
+    flowing while AppleScript talks to Chrome (up to 5 seconds).
+    """
     try:
-        webbrowser.open(url)
-        return True
+        proc = await asyncio.create_subprocess_exec(
+            'osascript', '-e', _browser_tab_script(url),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            await asyncio.wait_for(proc.communicate(), timeout=5)
+        except asyncio.TimeoutError:
+            proc.kill()
+            raise
+        if proc.returncode == 0:
+            return True
     except Exception:
-        return False
+        pass
+
+    return _open_browser_fallback(url)
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that coalesces log writes.
+
+    A bigger stream buffer alone wouldn't help: StreamHandler.emit()
+    calls flush() after every record. Rate-limiting the flush is what
+    lets the 64 KiB buffer actually batch records into one syscall.
+    When a flush is skipped, a one-shot timer picks it up, so every
+    record reaches disk within FLUSH_INTERVAL seconds even if the
+    daemon then goes quiet; close() (and file rotation, which closes
+    the stream) still writes everything out immediately.
+    """
+
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_flush = time.monotonic()
+        self._flush_timer = None
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536,
+                    encoding=self.encoding)
+
+    def flush(self):
+        now = time.monotonic()
+        elapsed = now - self._last_flush
+        if elapsed < self.FLUSH_INTERVAL:
+            # Skipped - arm a timer so the buffered record still hits
+            # disk on schedule if no further emit comes along
+            if self._flush_timer is None:
+                timer = threading.Timer(
+                    self.FLUSH_INTERVAL - elapsed, self._timed_flush
+                )
+                timer.daemon = True
+                self._flush_timer = timer
+                timer.start()
+            return
+        self._last_flush = now
+        super().flush()
+
+    def _timed_flush(self):
+        # Runs on the timer thread; the handler lock serializes against
+        # the QueueListener thread's emits and close()
+        self.acquire()
+        try:
+            self._flush_timer = None
+            self._last_flush = time.monotonic()
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self):
+        timer = self._flush_timer
+        if timer is not None:
+            timer.cancel()
+        # FileHandler.close goes through self.flush(); make sure the
+        # final flush isn't rate-limited away
+        self._last_flush = float("-inf")
+        super().close()
 
 
 class NoiseFilter(logging.Filter):
@@ -131,7 +238,9 @@ def setup_logging():
         # Set restrictive umask for log file creation
         old_umask = os.umask(0o077)
         try:
-            file_handler = logging.FileHandler(LOG_FILE)
+            file_handler = BufferedRotatingFileHandler(
+                LOG_FILE, maxBytes=5_000_000, backupCount=3
+            )
         finally:
             os.umask(old_umask)
 
@@ -147,10 +256,24 @@ def setup_logging():
     except Exception as e:
         print(f"Warning: Could not create log file {LOG_FILE}: {e}")
 
+    # Hand records to a background thread so file writes never run on
+    # the asyncio loop; the real handlers live behind the listener
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    # The QueueHandler's prepare() pre-formats the record with whatever
+    # formatter it carries, and the listener-side handlers format again
+    # on top - so give it a message-only formatter (and no format= in
+    # basicConfig, which would assign the full one) to keep the real
+    # formatting pass with the handlers behind the listener. Otherwise
+    # every line gets the asctime/name/level prefix twice.
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
     logging.basicConfig(
         level=log_level,
-        format=log_format,
-        handlers=handlers,
+        handlers=[queue_handler],
     )
 
     # Reduce noise from other loggers
@@ -167,10 +290,20 @@ logger = logging.getLogger(__name__)
 
 
 def is_port_in_use(port: int) -> bool:
-    """Check if a port is already in use."""
+    """Check if a port is already in use.
+
+    Uses a bind probe rather than a connect: bind fails immediately with
+    EADDRINUSE when the port is taken, so startup never sits out a
+    connect timeout. SO_REUSEADDR keeps TIME_WAIT entries from a
+    just-stopped daemon from reading as a live listener.
+    """
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(1)
-        return s.connect_ex(('localhost', port)) == 0
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            s.bind(('127.0.0.1', port))
+        except OSError as e:
+            return e.errno in (errno.EADDRINUSE, errno.EACCES)
+        return False
 
 
 async def main_iterm2(connection, start_web=True):
@@ -213,7 +346,7 @@ async def main_iterm2(connection, start_web=True):
                 logger.warning(f"Port {WEB_PORT} already in use - web GUI disabled")
                 logger.info(f"Another Claude Continue instance may be running. Visit {web_url}")
                 print(f"Web GUI already running at {web_url}")
-                open_browser_tab(web_url)
+                await open_browser_tab_async(web_url)
                 start_web = False
             else:
                 try:
@@ -221,7 +354,7 @@ async def main_iterm2(connection, start_web=True):
                     logger.info(f"Web GUI available at {web_url}")
                     print(f"Web GUI running at {web_url}")
                     # Auto-open browser (reuses existing tab if open)
-                    open_browser_tab(web_url)
+                    await open_browser_tab_async(web_url)
                 except Exception as e:
                     logger.warning(f"Could not start web GUI: {e}")
                     print(f"Web GUI failed to start: {e}")
@@ -240,6 +373,12 @@ async def main_iterm2(connection, start_web=True):
         except Exception as e:
             logger.error(f"Error stopping session manager: {e}")
 
+        try:
+            from src.deepseek_client import deepseek_client
+            await deepseek_client.close()
+        except Exception as e:
+            logger.error(f"Error closing DeepSeek session: {e}")
+
         if web_runner:
             try:
                 await stop_web_server(web_runner)
@@ -315,19 +454,34 @@ def main_test():
     logger.info("Test mode completed")
 
 
-def print_startup_banner(show_web: bool = True):
-    """Print the startup banner."""
-    BORDER = '\033[94m'
-    TEXT = '\033[97m'
-    ACCENT = '\033[92m'
-    RESET = '\033[0m'
-    def center_line(text: str) -> str:
-        return f"║{text.center(69)}║"
-
-    web_gui_line = center_line("Web GUI: http://localhost:7777") if show_web else center_line("")
-    copyright_line = center_line("Copyright Anomaly Alpha Labs 2025")
-    tagline_line = center_line("iTerm2 Automation for Claude Code")
-    site_line = center_line("addicted.bot")
+_BORDER = '\033[94m'
+_TEXT = '\033[97m'
+_ACCENT = '\033[92m'
+_RESET = '\033[0m'
+
+
+def _center_line(text: str) -> str:
+    return f"║{text.center(69)}║"
+
+
+def _colorize_banner_line(line: str) -> str:
+    if line.startswith(("╔", "╚")):
+        return f"{_BORDER}{line}{_RESET}"
+    if line.startswith("║") and line.endswith("║"):
+        inner = line[1:-1]
+        if any(token in inner for token in ("Web GUI", "Copyright", "addicted.bot")):
+            inner_color = _ACCENT
+        else:
+            inner_color = _TEXT
+        return f"{_BORDER}║{inner_color}{inner}{_BORDER}║{_RESET}"
+    return f"{_TEXT}{line}{_RESET}"
+
+
+def _build_banner_template() -> str:
+    """Pre-color the banner once; only the web-GUI line varies at runtime."""
+    copyright_line = _center_line("Copyright Anomaly Alpha Labs 2025")
+    tagline_line = _center_line("iTerm2 Automation for Claude Code")
+    site_line = _center_line("addicted.bot")
     banner = f"""
 ╔═════════════════════════════════════════════════════════════════════╗
 ║                                                                     ║
@@ -344,37 +498,56 @@ def print_startup_banner(show_web: bool = True):
 ║  ██║     ██║   ██║██║╚██╗██║   ██║   ██║██║╚██╗██║██║   ██║██╔══╝   ║
 ║  ╚██████╗╚██████╔╝██║ ╚████║   ██║   ██║██║ ╚████║╚██████╔╝███████╗ ║
 ║   ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝   ╚═╝   ╚═╝╚═╝  ╚═══╝ ╚═════╝ ╚══════╝ ║
-{web_gui_line}
+<WEB_GUI_LINE>
 {copyright_line}
 {tagline_line}
 {site_line}
 ╚═════════════════════════════════════════════════════════════════════╝
 """
-    print()
+    lines = []
     for line in banner.strip("\n").splitlines():
-        if line.startswith(("╔", "╚")):
-            print(f"{BORDER}{line}{RESET}")
-            continue
-        if line.startswith("║") and line.endswith("║"):
-            inner = line[1:-1]
-            if any(token in inner for token in ("Web GUI", "Copyright", "addicted.bot")):
-                inner_color = ACCENT
-            else:
-                inner_color = TEXT
-            print(f"{BORDER}║{inner_color}{inner}{BORDER}║{RESET}")
-            continue
-        print(f"{TEXT}{line}{RESET}")
-
-    # Print disclaimer
-    WARNING = '\033[93m'
-    DIM = '\033[2m'
-    print()
-    print(f"{WARNING}⚠️  DISCLAIMER: This software is provided as-is.{RESET}")
-    print(f"{WARNING}   You run this service at your own risk.{RESET}")
-    print(f"{WARNING}   Auto-approving commands can be dangerous.{RESET}")
-    print()
-    print(f"{DIM}Press Ctrl+C to stop the daemon.{RESET}")
-    print()
+        if line == "<WEB_GUI_LINE>":
+            lines.append(line)
+        else:
+            lines.append(_colorize_banner_line(line))
+    return "\n" + "\n".join(lines) + "\n"
+
+
+_BANNER_TEMPLATE = _build_banner_template()
+
+_WARNING = '\033[93m'
+_DIM = '\033[2m'
+_DISCLAIMER = (
+    f"\n{_WARNING}⚠️  DISCLAIMER: This software is provided as-is.{_RESET}\n"
+    f"{_WARNING}   You run this service at your own risk.{_RESET}\n"
+    f"{_WARNING}   Auto-approving commands can be dangerous.{_RESET}\n"
+    f"\n{_DIM}Press Ctrl+C to stop the daemon.{_RESET}\n\n"
+)
+
+
+def print_startup_banner(show_web: bool = True):
+    """Print the startup banner with a single stdout write."""
+    web_gui_line = _center_line("Web GUI: http://localhost:7777" if show_web else "")
+    banner = _BANNER_TEMPLATE.replace(
+        "<WEB_GUI_LINE>", _colorize_banner_line(web_gui_line)
+    )
+    sys.stdout.write(banner + _DISCLAIMER)
+    sys.stdout.flush()
+
+
+def _install_uvloop():
+    """Install uvloop's event loop policy when available.
+
+    uvloop is optional; the daemon runs fine on vanilla asyncio. Installing
+    the policy before iTerm2 creates its loop makes every await in the
+    monitor path cheaper.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("uvloop event loop policy installed")
 
 
 def run_daemon(start_web=True):
@@ -391,6 +564,8 @@ def run_daemon(start_web=True):
         sys.exit(1)
 
     logger.info("Starting Claude Continue daemon with iTerm2...")
+    _install_uvloop()
+
     # Wrap main_iterm2 to pass the web flag
     async def main_with_web(connection):
         await main_iterm2(connection, start_web=start_web)
@@ -3,14 +3,32 @@ DeepSeek API client for intelligent question answering and follow-up generation.
 Uses rate limiting to stay within budget (default: 5 calls/hour).
 """
 import os
+import json
 import time
 import logging
 import configparser
 from typing import Optional
 from pathlib import Path
+from collections import deque
 from dataclasses import dataclass
 import aiohttp
 
+# Optional fast JSON for the request/response bodies
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to JSON bytes, via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,11 +44,16 @@ class DeepSeekConfig:
 
 
 class RateLimiter:
-    """Simple rate limiter tracking calls per hour."""
+    """Simple rate limiter tracking calls per hour.
+
+    Timestamps are appended in order, so expiry only ever pops from the
+    left and every operation is O(1). The monotonic clock keeps the
+    window immune to wall-clock adjustments.
+    """
 
     def __init__(self, max_calls_per_hour: int = 5):
         self.max_calls = max_calls_per_hour
-        self.calls: list[float] = []
+        self.calls: deque[float] = deque()
 
     def can_call(self) -> bool:
         """Check if we can make another call."""
@@ -39,12 +62,13 @@ class RateLimiter:
 
     def record_call(self):
         """Record a call."""
-        self.calls.append(time.time())
+        self.calls.append(time.monotonic())
 
     def _cleanup_old_calls(self):
         """Remove calls older than 1 hour."""
-        one_hour_ago = time.time() - 3600
-        self.calls = [t for t in self.calls if t > one_hour_ago]
+        cutoff = time.monotonic() - 3600
+        while self.calls and self.calls[0] <= cutoff:
+            self.calls.popleft()
 
     def remaining_calls(self) -> int:
         """Return number of calls remaining this hour."""
@@ -55,11 +79,9 @@ class RateLimiter:
         """Seconds until next call is available (0 if available now)."""
         if self.can_call():
             return 0
-        self._cleanup_old_calls()
         if not self.calls:
             return 0
-        oldest = min(self.calls)
-        return max(0, oldest + 3600 - time.time())
+        return max(0, self.calls[0] + 3600 - time.monotonic())
 
 
 def load_config() -> Optional[DeepSeekConfig]:
@@ -123,15 +145,41 @@ Be concise - responses should be short and actionable.
 For questions, give direct answers.
 For follow-ups, suggest what to ask Claude next."""
 
+    # How long a can_call result stays valid (seconds).  The rate limiter
+    # is conservative, so a brief staleness window can't blow the budget.
+    CAN_CALL_TTL = 0.5
+
     def __init__(self):
         self.config = load_config()
         if self.config:
             self.rate_limiter = RateLimiter(self.config.calls_per_hour)
+            # The endpoint, headers, and everything but the user message
+            # never change, so compose them once
+            self._url = f"{self.config.base_url}/chat/completions"
+            self._headers = {
+                "Authorization": f"Bearer {self.config.api_key}",
+                "Content-Type": "application/json",
+            }
+            self._base_payload = {
+                "model": self.config.model,
+                "max_tokens": self.config.max_tokens,
+                "temperature": self.config.temperature,
+            }
+            self._system_message = {"role": "system", "content": self.SYSTEM_PROMPT}
             logger.info(f"DeepSeek client initialized (max {self.config.calls_per_hour} calls/hour)")
         else:
             self.rate_limiter = None
             logger.info("DeepSeek not configured - using pattern-based responses only")
 
+        # Cached can_call result so concurrent decide bursts don't hammer
+        # the rate limiter's call-list scan.
+        self._can_call_cached = False
+        self._can_call_ts = -1.0
+
+        # Long-lived HTTP session (created lazily on first call) so TLS
+        # connections and DNS lookups are reused across API calls.
+        self._session: Optional[aiohttp.ClientSession] = None
+
     @property
     def is_available(self) -> bool:
         """Check if DeepSeek is configured and available."""
@@ -139,8 +187,22 @@ For follow-ups, suggest what to ask Claude next."""
 
     @property
     def can_call(self) -> bool:
-        """Check if we can make a call (configured + not rate limited)."""
-        return self.is_available and self.rate_limiter.can_call()
+        """Check if we can make a call (configured + not rate limited).
+
+        The result is cached for CAN_CALL_TTL seconds; recording a call
+        invalidates it immediately.
+        """
+        now = time.monotonic()
+        if now - self._can_call_ts < self.CAN_CALL_TTL:
+            return self._can_call_cached
+        self._can_call_cached = self.is_available and self.rate_limiter.can_call()
+        self._can_call_ts = now
+        return self._can_call_cached
+
+    def _record_call(self):
+        """Record an API call and invalidate the cached can_call result."""
+        self.rate_limiter.record_call()
+        self._can_call_ts = -1.0
 
     def get_status(self) -> dict:
         """Get current status for web GUI."""
@@ -177,16 +239,17 @@ For follow-ups, suggest what to ask Claude next."""
             return None
 
         try:
-            user_message = f"""Terminal context:
-{context[-2000:] if context else '(no context)'}
-
-Question to answer:
-{question}
-
-Provide a concise, helpful answer."""
+            user_message = "\n".join((
+                "Terminal context:",
+                self._context_tail(context, 2000),
+                "",
+                "Question to answer:",
+                question,
+                "",
+                "Provide a concise, helpful answer.",
+            ))
 
             response = await self._call_api(user_message)
-            self.rate_limiter.record_call()
             logger.info(f"DeepSeek answered question ({self.rate_limiter.remaining_calls()} calls remaining)")
             return response
 
@@ -213,19 +276,20 @@ Provide a concise, helpful answer."""
             return None
 
         try:
-            user_message = f"""Terminal context (recent Claude Code output):
-{context[-3000:] if context else '(no context)'}
-
-Claude appears to be idle. Generate a helpful follow-up prompt to continue the work.
-The prompt should:
-- Be concise (1-2 sentences)
-- Ask Claude to continue or explain next steps
-- Be prefixed with [AUTO] to indicate it's automated
-
-Just respond with the follow-up prompt, nothing else."""
+            user_message = "\n".join((
+                "Terminal context (recent Claude Code output):",
+                self._context_tail(context, 3000),
+                "",
+                "Claude appears to be idle. Generate a helpful follow-up prompt to continue the work.",
+                "The prompt should:",
+                "- Be concise (1-2 sentences)",
+                "- Ask Claude to continue or explain next steps",
+                "- Be prefixed with [AUTO] to indicate it's automated",
+                "",
+                "Just respond with the follow-up prompt, nothing else.",
+            ))
 
             response = await self._call_api(user_message)
-            self.rate_limiter.record_call()
             logger.info(f"DeepSeek generated follow-up ({self.rate_limiter.remaining_calls()} calls remaining)")
 
             # Ensure [AUTO] prefix
@@ -238,35 +302,85 @@ Just respond with the follow-up prompt, nothing else."""
             logger.error(f"DeepSeek API error: {e}")
             return None
 
+    @staticmethod
+    def _context_tail(context: str, limit: int) -> str:
+        """Return at most the last limit characters of context.
+
+        Skips the slice (and its copy) entirely when the context already
+        fits, which is the common case outside deep scrollbacks.
+        """
+        if not context:
+            return "(no context)"
+        return context if len(context) <= limit else context[-limit:]
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300),
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session (called on daemon shutdown)."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
     async def _call_api(self, user_message: str) -> Optional[str]:
         """Make the actual API call."""
         if not self.config:
             return None
 
-        url = f"{self.config.base_url}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.config.api_key}",
-            "Content-Type": "application/json",
-        }
+        url = self._url
+        headers = self._headers
         payload = {
-            "model": self.config.model,
+            **self._base_payload,
             "messages": [
-                {"role": "system", "content": self.SYSTEM_PROMPT},
+                self._system_message,
                 {"role": "user", "content": user_message},
             ],
-            "max_tokens": self.config.max_tokens,
-            "temperature": self.config.temperature,
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, headers=headers) as resp:
-                if resp.status != 200:
-                    error_text = await resp.text()
-                    raise Exception(f"API error {resp.status}: {error_text}")
+        session = self._get_session()
+        timeout = aiohttp.ClientTimeout(total=20, connect=5, sock_read=15)
+        deadline = time.monotonic() + 20
+        last_error: Optional[Exception] = None
+
+        # One retry, for connection failures and 5xx only, within the
+        # overall deadline. Quota is recorded only on a successful
+        # response so a dead endpoint can't eat the hourly budget.
+        for _ in range(2):
+            if time.monotonic() >= deadline:
+                break
+            try:
+                async with session.post(
+                    url, data=_dumps(payload), headers=headers, timeout=timeout
+                ) as resp:
+                    if resp.status >= 500:
+                        error_text = await resp.text()
+                        last_error = Exception(f"API error {resp.status}: {error_text}")
+                        continue
+                    if resp.status != 200:
+                        error_text = await resp.text()
+                        raise Exception(f"API error {resp.status}: {error_text}")
+
+                    data = _loads(await resp.read())
+                    self._record_call()
+                    return data["choices"][0]["message"]["content"].strip()
+            except aiohttp.ClientConnectorError as e:
+                last_error = e
+                continue
 
-                data = await resp.json()
-                return data["choices"][0]["message"]["content"].strip()
+        if last_error is not None:
+            raise last_error
+        return None
 
 
-# Global instance
-deepseek_client = DeepSeekClient()
+# Global instance, created on first access so importing this module (or
+# running --test / --setup) doesn't read and parse the config files
+def __getattr__(name):
+    if name == "deepseek_client":
+        instance = globals()["deepseek_client"] = DeepSeekClient()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
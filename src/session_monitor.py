@@ -31,6 +31,9 @@ ANSI_ESCAPE_PATTERN = re.compile(
 from config import (
     ACTION_COOLDOWN_SECONDS,
     SCREEN_POLL_INTERVAL,
+    SCREEN_POLL_MIN,
+    SCREEN_POLL_MAX,
+    SCREEN_POLL_BACKOFF,
     AUTO_APPROVE_ALL,
     AUTO_CONTINUE,
     CONTINUE_MESSAGE,
@@ -39,10 +42,9 @@ from config import (
     AUTO_FOLLOWUP,
     FOLLOWUP_DELAY,
     FOLLOWUP_COOLDOWN,
-    FOLLOWUP_PROMPTS,
+    next_followup,
     DEBUG,
 )
-import random
 from src.pattern_detector import PatternDetector, PromptType, DetectedPrompt
 from src.smart_responder import SmartResponder
 from src.deepseek_client import deepseek_client
@@ -69,7 +71,6 @@ class SessionState:
     action_count: int = 0
     is_claude_session: bool = False
     last_followup_time: float = 0.0  # Track follow-up cooldown
-    followup_index: int = 0  # Rotate through follow-up prompts
 
 
 class SessionMonitor:
@@ -130,34 +131,50 @@ class SessionMonitor:
             await self._polling_loop()
 
     async def _polling_loop(self):
-        """Fallback polling loop for screen content."""
+        """Fallback polling loop for screen content.
+
+        Uses an adaptive interval: polls at SCREEN_POLL_MIN while the
+        screen is changing, then backs off exponentially toward
+        SCREEN_POLL_MAX when the session goes idle. This cuts idle
+        wakeups several-fold while improving latency under activity.
+        """
+        interval = SCREEN_POLL_INTERVAL
         while self.running:
             try:
                 contents = await self.session.async_get_screen_contents()
+                changed = False
                 if contents:
-                    await self._process_screen(contents)
-                await asyncio.sleep(SCREEN_POLL_INTERVAL)
+                    changed = await self._process_screen(contents)
+                if changed:
+                    interval = SCREEN_POLL_MIN
+                else:
+                    interval = min(SCREEN_POLL_MAX, interval * SCREEN_POLL_BACKOFF)
+                await asyncio.sleep(interval)
             except Exception as e:
                 logger.error(f"Error polling screen: {e}")
                 await asyncio.sleep(1)
 
-    async def _process_screen(self, contents):
-        """Process screen contents and respond to prompts."""
+    async def _process_screen(self, contents) -> bool:
+        """Process screen contents and respond to prompts.
+
+        Returns True if the screen content changed since the last check
+        (used by the adaptive poller to decide how soon to poll again).
+        """
         # Get text content from screen
         screen_text = self._extract_text(contents)
         if not screen_text:
-            return
+            return False
 
         # Check if screen has changed
         screen_hash = hash(screen_text)
         if screen_hash == self.state.last_screen_hash:
-            return
+            return False
         self.state.last_screen_hash = screen_hash
 
         # Check cooldown
         now = time.time()
         if now - self.state.last_action_time < ACTION_COOLDOWN_SECONDS:
-            return
+            return True
 
         # Detect prompts
         prompt = self.detector.detect(screen_text)
@@ -167,12 +184,12 @@ class SessionMonitor:
                 with open("/tmp/claude_screen_dump.txt", "w") as f:
                     f.write(screen_text)
                 logger.info(f"Claude session - {len(screen_text)} chars, {len(screen_text.split(chr(10)))} lines - dumped to /tmp/claude_screen_dump.txt")
-            return
+            return True
 
         # Skip if we already handled this prompt
         if self.detector.is_same_prompt(prompt):
             logger.info(f"Skipping duplicate {prompt.prompt_type.value}: {prompt.text[:50]}")
-            return
+            return True
 
         # Log detection
         if DEBUG:
@@ -180,6 +197,7 @@ class SessionMonitor:
 
         # Handle the prompt
         await self._handle_prompt(prompt)
+        return True
 
     def _extract_text(self, contents) -> str:
         """Extract and sanitize text from iTerm2 screen contents.
@@ -347,14 +365,9 @@ class SessionMonitor:
                         action_type = f"deepseek-followup: {response[:30]}..."
                         logger.info(f"DeepSeek generated follow-up: {response[:50]}")
 
-                # Fall back to predefined prompts
-                if not response and FOLLOWUP_PROMPTS:
-                    # Shuffle on first use, then rotate
-                    if self.state.followup_index == 0:
-                        random.shuffle(FOLLOWUP_PROMPTS)
-
-                    response = FOLLOWUP_PROMPTS[self.state.followup_index % len(FOLLOWUP_PROMPTS)]
-                    self.state.followup_index += 1
+                # Fall back to predefined prompts (pre-shuffled rotation)
+                if not response:
+                    response = next_followup()
                     action_type = f"followup: {response[:30]}..."
                     logger.debug(f"Sending follow-up prompt: {response}")
 
@@ -487,22 +500,25 @@ class SessionManager:
         # cross-session interference with dedup tracking
         self.responder = SmartResponder()
         self._discovery_task: Optional[asyncio.Task] = None
+        self._event_task: Optional[asyncio.Task] = None
 
         logger.debug("Using Smart Regex for fast offline responses")
 
     async def start(self):
         """Start session discovery and monitoring."""
         self._discovery_task = asyncio.create_task(self._discovery_loop())
+        self._event_task = asyncio.create_task(self._watch_session_events())
         logger.debug("Session manager started")
 
     async def stop(self):
         """Stop all monitors and cleanup."""
-        if self._discovery_task:
-            self._discovery_task.cancel()
-            try:
-                await self._discovery_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._discovery_task, self._event_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
 
         # Stop all monitors
         for monitor in self.monitors.values():
@@ -512,6 +528,30 @@ class SessionManager:
 
         logger.debug("Session manager stopped")
 
+    async def _watch_session_events(self):
+        """Run a discovery sweep whenever iTerm2 reports a new session.
+
+        Notifications arrive over the existing WebSocket, so new panes
+        get a monitor in milliseconds instead of waiting out the next
+        SESSION_POLL_INTERVAL sweep. The periodic sweep keeps running as
+        housekeeping - it also handles terminated sessions and re-checks
+        panes where Claude Code starts later.
+        """
+        import iterm2
+
+        try:
+            async with iterm2.NewSessionMonitor(self.app.connection) as mon:
+                while True:
+                    await mon.async_get()
+                    try:
+                        await self._discover_sessions()
+                    except Exception as e:
+                        logger.error(f"Error in event-driven discovery: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Session notifications unavailable, relying on polling: {e}")
+
     async def _discovery_loop(self):
         """Periodically discover and monitor new sessions."""
         from config import SESSION_POLL_INTERVAL
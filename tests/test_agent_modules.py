@@ -73,6 +73,66 @@ class TestStateModule:
         assert state.similar_observations_count >= 3
         assert state.is_stuck is True
 
+    def test_similar_despite_spinner_churn(self, state_module, mock_session_id):
+        """Screens differing only in spinner frames still count as similar."""
+        base = "Running tests\nCollecting items\nWorking on module {}\nPlease wait"
+        for spinner in ("|", "/", "-", "\\"):
+            state_module.record_observation(
+                session_id=mock_session_id,
+                screen_content=base.format(spinner),
+                prompt_type="permission",
+            )
+
+        state = state_module.get_state(mock_session_id)
+        assert state.similar_observations_count >= 3
+
+    def test_different_screens_reset_similarity(self, state_module, mock_session_id):
+        """Genuinely different content resets the similarity counter."""
+        state_module.record_observation(
+            session_id=mock_session_id,
+            screen_content="Same content\nLine 2\nLine 3",
+            prompt_type="permission",
+        )
+        state_module.record_observation(
+            session_id=mock_session_id,
+            screen_content="Same content\nLine 2\nLine 3",
+            prompt_type="permission",
+        )
+
+        state = state_module.get_state(mock_session_id)
+        assert state.similar_observations_count == 1
+
+        # Same shape, entirely different words - not a near-duplicate
+        state_module.record_observation(
+            session_id=mock_session_id,
+            screen_content="Compiling project\nLinking binary\nDone",
+            prompt_type="permission",
+        )
+
+        assert state.similar_observations_count == 0
+        assert state.is_stuck is False
+
+    def test_identical_screen_reuses_observation(self, state_module, mock_session_id):
+        """Byte-identical screens reuse the previous observation object."""
+        first = state_module.record_observation(
+            session_id=mock_session_id,
+            screen_content="Idle screen\nWaiting for input",
+            prompt_type="permission",
+            prompt_text="Allow edit?",
+        )
+        second = state_module.record_observation(
+            session_id=mock_session_id,
+            screen_content="Idle screen\nWaiting for input",
+            prompt_type="permission",
+            prompt_text="Allow edit?",
+        )
+
+        assert second is first
+
+        state = state_module.get_state(mock_session_id)
+        assert state.total_observations == 2
+        assert state.similar_observations_count == 1
+
     def test_phase_transitions(self, state_module, mock_session_id):
         """Test phase transitions."""
         from src.agent.state_module import AgentPhase
@@ -0,0 +1,206 @@
+"""
+Tests for the DeepSeek API client: rate limiting and the retry/quota
+behaviour of _call_api.
+"""
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import pytest
+
+from src.deepseek_client import DeepSeekClient, DeepSeekConfig, RateLimiter
+
+
+# ============================================================
+# Fakes
+# ============================================================
+
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response context manager."""
+
+    def __init__(self, status, content="", error_text=""):
+        self.status = status
+        self._body = json.dumps(
+            {"choices": [{"message": {"content": content}}]}
+        ).encode()
+        self._error_text = error_text
+
+    async def read(self):
+        return self._body
+
+    async def text(self):
+        return self._error_text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """Session whose post() replays a scripted list of outcomes.
+
+    Each outcome is either a FakeResponse or an exception to raise.
+    """
+
+    closed = False
+
+    def __init__(self, *outcomes):
+        self._outcomes = list(outcomes)
+        self.post_count = 0
+
+    def post(self, url, **kwargs):
+        self.post_count += 1
+        outcome = self._outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _connector_error():
+    return aiohttp.ClientConnectorError(MagicMock(), OSError("refused"))
+
+
+# ============================================================
+# Fixtures
+# ============================================================
+
+@pytest.fixture
+def client():
+    """A configured client that never touches config files or the network."""
+    config = DeepSeekConfig(api_key="test-key")
+    with patch("src.deepseek_client.load_config", return_value=config):
+        yield DeepSeekClient()
+
+
+# ============================================================
+# RateLimiter Tests
+# ============================================================
+
+class TestRateLimiter:
+    """Tests for the rate limiter."""
+
+    def test_under_limit(self):
+        """Calls are allowed until the hourly budget is used up."""
+        limiter = RateLimiter(max_calls_per_hour=2)
+        assert limiter.can_call() is True
+        assert limiter.remaining_calls() == 2
+        assert limiter.seconds_until_next() == 0
+
+        limiter.record_call()
+        assert limiter.can_call() is True
+        assert limiter.remaining_calls() == 1
+
+        limiter.record_call()
+        assert limiter.can_call() is False
+        assert limiter.remaining_calls() == 0
+
+    def test_window_expiry(self, monkeypatch):
+        """Calls older than one hour fall out of the window."""
+        now = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+
+        limiter = RateLimiter(max_calls_per_hour=2)
+        limiter.record_call()
+        now[0] += 10
+        limiter.record_call()
+        assert limiter.can_call() is False
+        assert limiter.seconds_until_next() == pytest.approx(3590)
+
+        # First call expires, freeing one slot
+        now[0] += 3591
+        assert limiter.can_call() is True
+        assert limiter.remaining_calls() == 1
+
+        # Second call expires too
+        now[0] += 10
+        assert limiter.remaining_calls() == 2
+        assert limiter.seconds_until_next() == 0
+
+
+# ============================================================
+# DeepSeekClient Tests
+# ============================================================
+
+class TestCallApi:
+    """Tests for _call_api retry and quota behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_success_records_one_call(self, client):
+        """A 200 response returns the content and uses one quota slot."""
+        session = FakeSession(FakeResponse(200, content="  answer  "))
+        client._session = session
+
+        result = await client._call_api("question")
+
+        assert result == "answer"
+        assert session.post_count == 1
+        assert len(client.rate_limiter.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_client_error_raises_without_retry(self, client):
+        """A 4xx raises immediately and doesn't consume quota."""
+        session = FakeSession(FakeResponse(401, error_text="bad key"))
+        client._session = session
+
+        with pytest.raises(Exception, match="API error 401"):
+            await client._call_api("question")
+
+        assert session.post_count == 1
+        assert len(client.rate_limiter.calls) == 0
+
+    @pytest.mark.asyncio
+    async def test_server_error_retried_once(self, client):
+        """A 5xx is retried; the successful retry uses one quota slot."""
+        session = FakeSession(
+            FakeResponse(503, error_text="overloaded"),
+            FakeResponse(200, content="answer"),
+        )
+        client._session = session
+
+        result = await client._call_api("question")
+
+        assert result == "answer"
+        assert session.post_count == 2
+        assert len(client.rate_limiter.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_repeated_server_errors_raise(self, client):
+        """Two 5xx responses exhaust the retry and consume no quota."""
+        session = FakeSession(
+            FakeResponse(500, error_text="boom"),
+            FakeResponse(500, error_text="boom"),
+        )
+        client._session = session
+
+        with pytest.raises(Exception, match="API error 500"):
+            await client._call_api("question")
+
+        assert session.post_count == 2
+        assert len(client.rate_limiter.calls) == 0
+
+    @pytest.mark.asyncio
+    async def test_connection_error_retried(self, client):
+        """A connection failure is retried without consuming quota."""
+        session = FakeSession(
+            _connector_error(),
+            FakeResponse(200, content="answer"),
+        )
+        client._session = session
+
+        result = await client._call_api("question")
+
+        assert result == "answer"
+        assert session.post_count == 2
+        assert len(client.rate_limiter.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_client_returns_none(self):
+        """Without config, _call_api is a no-op."""
+        with patch("src.deepseek_client.load_config", return_value=None):
+            client = DeepSeekClient()
+
+        assert await client._call_api("question") is None
+        assert client.is_available is False